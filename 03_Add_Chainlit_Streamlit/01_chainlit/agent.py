@@ -1,35 +1,23 @@
 import os
 import asyncio
-from dotenv import load_dotenv
+import logging
 import chainlit as cl
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, RunConfig
+from agents import Agent, Runner
+from openai.types.responses import ResponseTextDeltaEvent
+from gemini_shared import AdmissionController, AdmissionRejected, GenerationTracker, cancellation_stats, get_config
 
-# Load environment variables
-load_dotenv()
+# Shared, pooled Gemini client and config
+config = get_config("gemini-1.5-flash")
 
-# Get Gemini API Key from .env
-gemini_api_key = os.getenv("GEMINI_API_KEY")
-if not gemini_api_key:
-    raise ValueError("GEMINI_API_KEY is not set. Please check your .env file.")
+# Admission and cancellation details; visible with logging set to DEBUG
+logger = logging.getLogger(__name__)
 
-# Create OpenAI-compatible Gemini client
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-
-# Create model object
-model = OpenAIChatCompletionsModel(
-    model="gemini-1.5-flash",
-    openai_client=external_client
-)
-
-# Create config for running the agent
-config = RunConfig(
-    model=model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+# Cap on generations running at once; further messages wait their turn, round-robin across users,
+# and are turned away with a retry hint once the waiting room is full
+MAX_CONCURRENT_GENERATIONS = int(os.getenv("MAX_CONCURRENT_GENERATIONS", "16"))
+MAX_QUEUED_GENERATIONS = int(os.getenv("MAX_QUEUED_GENERATIONS", "64"))
+MAX_QUEUED_PER_USER = int(os.getenv("MAX_QUEUED_PER_USER", "2"))
+admission = AdmissionController(MAX_CONCURRENT_GENERATIONS, MAX_QUEUED_GENERATIONS, MAX_QUEUED_PER_USER)
 
 # Create Writer Agent
 writer_agent = Agent(
@@ -43,6 +31,9 @@ writer_agent = Agent(
 # Welcome message with big heading
 @cl.on_chat_start
 async def on_chat_start():
+    # Track the answer being written so a new message or a disconnect can cancel it
+    cl.user_session.set("generations", GenerationTracker())
+
     await cl.Message(
         content="""
 # ✍️ Writer Agent
@@ -56,25 +47,73 @@ Welcome! I can help you write **essays**, **poems**, **emails**, **stories**, an
 @cl.on_message
 async def handle_message(message: cl.Message):
     user_input = message.content
+    tracker: GenerationTracker = cl.user_session.get("generations")
+    generation = None
+
+    # Create an empty message and stream the answer into it
+    msg = cl.Message(author=writer_agent.name, content="")
+    await msg.send()
 
-    await cl.Message(content="⏳ Generating your response...").send()
+    # Stop this session's previous answer now, so it does not hold a slot this message waits for
+    tracker.cancel("superseded")
 
     try:
-        # Run synchronous Runner inside async using thread executor
-        result = await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: Runner.run_sync(
+        async with admission.slot(cl.context.session.id):
+            # Run on Chainlit's own event loop and push tokens as they arrive
+            result = Runner.run_streamed(
                 writer_agent,
                 input=user_input,
                 run_config=config
             )
-        )
+            # Track this answer so a newer message or the stop button can cancel it
+            generation = tracker.start(result)
+            async for event in result.stream_events():
+                if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                    generation.add(event.data.delta)
+                    await msg.stream_token(event.data.delta)
+            if generation.cancelled:
+                raise asyncio.CancelledError
 
-        # Send result to Chainlit UI
-        await cl.Message(
-            author=writer_agent.name,
-            content=result.final_output
-        ).send()
+        await msg.update()
+        logger.debug("admission: %s", admission.snapshot())
+
+    except AdmissionRejected as e:
+        msg.content = f"⏳ {str(e)}"
+        await msg.update()
+        logger.debug("admission rejected, retry after %.1fs: %s", e.retry_after, admission.snapshot())
+
+    except asyncio.CancelledError:
+        msg.content += "\n\n*(stopped)*"
+        await msg.update()
+        if generation is not None and generation.cancelled:
+            logger.debug(
+                "cancelled (%s) after %d tokens; saved ~%.0f tokens and ~%.1fs "
+                "(all sessions: ~%.0f tokens, ~%.1fs)",
+                generation.cancel_reason,
+                generation.tokens,
+                generation.tokens_saved,
+                generation.seconds_saved,
+                cancellation_stats.tokens_saved,
+                cancellation_stats.seconds_saved,
+            )
 
     except Exception as e:
-        await cl.Message(content=f"❌ Error: {str(e)}").send()
\ No newline at end of file
+        msg.content = f"❌ Error: {str(e)}"
+        await msg.update()
+
+    finally:
+        if generation is not None:
+            tracker.finish(generation)
+
+# Cancel the answer in flight on the stop button or when the user leaves
+@cl.on_stop
+async def on_stop():
+    tracker = cl.user_session.get("generations")
+    if tracker is not None:
+        tracker.cancel("stopped")
+
+@cl.on_chat_end
+async def on_chat_end():
+    tracker = cl.user_session.get("generations")
+    if tracker is not None:
+        tracker.cancel("disconnected")
\ No newline at end of file
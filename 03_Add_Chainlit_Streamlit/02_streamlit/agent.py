@@ -1,12 +1,19 @@
+import logging
 import os
-import asyncio
+import time
+import uuid
 import streamlit as st
 from dotenv import load_dotenv
 
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel, RunConfig
+from agents import Agent, Runner, RunConfig
+from openai.types.responses import ResponseTextDeltaEvent
+from gemini_shared import AdmissionController, AdmissionRejected, BackgroundLoop, get_config
 
 # Load environment variables
 load_dotenv()
+
+# Admission details; visible with logging set to DEBUG
+logger = logging.getLogger(__name__)
 gemini_api_key = os.getenv("GEMINI_API_KEY")
 
 # Streamlit page setup
@@ -32,36 +39,87 @@ if not gemini_api_key:
     st.error("❌ GEMINI_API_KEY is missing. Please set it in a `.env` file.")
     st.stop()
 
-# Set up Gemini as OpenAI-compatible client
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
+# Objects below survive Streamlit reruns and are shared by every user session.
+@st.cache_resource
+def get_loop() -> BackgroundLoop:
+    # One event loop for the whole process, so the pooled client keeps its connections
+    return BackgroundLoop()
+
+@st.cache_resource
+def get_run_config() -> RunConfig:
+    return get_config()
+
+@st.cache_resource
+def get_admission() -> AdmissionController:
+    # Cap on answers generated at once; more wait their turn, round-robin across users
+    return AdmissionController(
+        max_concurrent=int(os.getenv("MAX_CONCURRENT_GENERATIONS", "16")),
+        max_queue=int(os.getenv("MAX_QUEUED_GENERATIONS", "64")),
+        max_queue_per_user=int(os.getenv("MAX_QUEUED_PER_USER", "2")),
+    )
+
+@st.cache_resource
+def get_agent() -> Agent:
+    return Agent(
+        name="Simple Agent",
+        instructions="A simple agent that can answer questions.",
+    )
 
-model = OpenAIChatCompletionsModel(
-    openai_client=external_client,
-    model="gemini-2.0-flash",
-)
+loop = get_loop()
+config = get_run_config()
+agent = get_agent()
+admission = get_admission()
 
-config = RunConfig(
-    model=model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+async def stream_answer(query: str, user_id: str):
+    """Yield the answer's text deltas as the model produces them."""
+    async with admission.slot(user_id):
+        result = Runner.run_streamed(agent, query, run_config=config)
+        async for event in result.stream_events():
+            if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                yield event.data.delta
 
-agent = Agent(
-    name="Simple Agent",
-    instructions="A simple agent that can answer questions.",
-)
+async def answer(query: str, user_id: str):
+    """Run the agent once a generation slot is free."""
+    async with admission.slot(user_id):
+        return await Runner.run(agent, query, run_config=config)
+
+def record_first_token(tokens, started: float):
+    """Pass tokens through, storing the time to first token of this query."""
+    for index, token in enumerate(tokens):
+        if index == 0:
+            st.session_state.ttft.append(time.perf_counter() - started)
+        yield token
+
+if "ttft" not in st.session_state:
+    st.session_state.ttft = []
+if "user_id" not in st.session_state:
+    st.session_state.user_id = uuid.uuid4().hex
 
 # Streamlit input
 query = st.text_input("Type your question here...")
+streaming = st.toggle("Stream the answer", value=True)
 
 if st.button("Submit") and query:
-    with st.spinner("Thinking..."):
-        try:
-            result = asyncio.run(Runner.run(agent, query, run_config=config))
+    try:
+        if streaming:
+            ttft = st.session_state.ttft
+            queries_before = len(ttft)
+            started = time.perf_counter()
+            st.success("✅ Answer:")
+            # Deltas are produced on the background loop and rendered here as they arrive
+            st.write_stream(record_first_token(loop.iterate(stream_answer(query, st.session_state.user_id)), started))
+            if len(ttft) > queries_before:
+                st.caption(
+                    f"⏱️ Time to first token: {ttft[-1]:.2f}s "
+                    f"(session average {sum(ttft) / len(ttft):.2f}s over {len(ttft)} queries)"
+                )
+        else:
+            with st.spinner("Thinking..."):
+                result = loop.run(answer(query, st.session_state.user_id))
             st.success("✅ Answer:")
             st.markdown(f"**{result.final_output}**")
-        except Exception as e:
-            st.error(f"❌ Error: {str(e)}")
+    except AdmissionRejected as e:
+        st.warning(f"⏳ {str(e)}")
+    except Exception as e:
+        st.error(f"❌ Error: {str(e)}")
+    logger.debug("admission: %s", admission.snapshot())
@@ -0,0 +1,69 @@
+import argparse
+import asyncio
+
+from agents import Agent
+from gemini_shared import DEFAULT_MODEL, batch_run_config, iter_prompts, run_batch_to_file, run_sharded
+
+# Free-tier quotas for gemini-2.0-flash; raise them to match your own project's limits.
+DEFAULT_RPM = 15
+DEFAULT_TPM = 1_000_000
+
+
+def make_agent() -> Agent:
+    # Module level, so worker processes can build their own copy
+    return Agent(
+        name="Assistant",
+        instructions="You are helpful Assistent.",
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a file of prompts through the agent concurrently.")
+    parser.add_argument("prompts", help="JSONL file: one string or {\"id\": ..., \"prompt\": ...} per line")
+    parser.add_argument("-o", "--output", default="results.jsonl", help="JSONL file results are appended to")
+    parser.add_argument("--concurrency", type=int, default=8, help="runs in flight at once (per process)")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes, for very large files")
+    parser.add_argument("--rpm", type=float, default=DEFAULT_RPM, help="requests per minute (0 = no limit)")
+    parser.add_argument("--tpm", type=float, default=DEFAULT_TPM, help="tokens per minute (0 = no limit)")
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--ordered", action="store_true", help="write results in input order")
+    parser.add_argument("--restart", action="store_true", help="overwrite the output instead of resuming")
+    args = parser.parse_args()
+
+    if args.processes > 1:
+        # Each process reads its share of the file; all of them share one RPM/TPM budget
+        summary = run_sharded(
+            make_agent,
+            args.prompts,
+            args.output,
+            processes=args.processes,
+            concurrency=args.concurrency,
+            model_name=args.model,
+            rpm=args.rpm,
+            tpm=args.tpm,
+            ordered=args.ordered,
+            resume=not args.restart,
+        )
+    else:
+        config = batch_run_config(args.model, rpm=args.rpm, tpm=args.tpm)
+        summary = asyncio.run(
+            run_batch_to_file(
+                make_agent(),
+                iter_prompts(args.prompts),
+                args.output,
+                run_config=config,
+                concurrency=args.concurrency,
+                ordered=args.ordered,
+                resume=not args.restart,
+            )
+        )
+    print(
+        f"{summary.succeeded} done, {summary.failed} failed, {summary.skipped} already done "
+        f"of {summary.total} in {summary.seconds:.1f}s "
+        f"({summary.input_tokens} input / {summary.output_tokens} output tokens)"
+    )
+    print(f"Results in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
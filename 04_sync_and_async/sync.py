@@ -1,37 +1,13 @@
-import os
-from dotenv import load_dotenv
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel
-from agents.run import RunConfig
+from agents import Agent
+from gemini_shared import get_config, get_model, run_sync
 
-# Load the environment variables from the .env file
-load_dotenv()
-
-gemini_api_key = os.getenv("GEMINI_API_KEY")
-
-# Check if the API key is present; if not, raise an error
-if not gemini_api_key:
-    raise ValueError("GEMINI_API_KEY is not set. Please ensure it is defined in your .env file.")
-
-#Reference: https://ai.google.dev/gemini-api/docs/openai
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
-
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=external_client
-)
-
-config = RunConfig(
-    model=model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+model = get_model()
+config = get_config()
 
 agent: Agent = Agent(name="Assistant", instructions="You are a helpful assistant", model=model)
 
-result = Runner.run_sync(agent, "Hello, how are you.", run_config=config)
+# Runs on the shared background loop, so repeated calls reuse the loop and the client
+result = run_sync(agent, "Hello, how are you.", run_config=config)
 
 print("\nCALLING AGENT\n")
 print(result.final_output)
\ No newline at end of file
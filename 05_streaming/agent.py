@@ -1,53 +1,114 @@
+import asyncio
+import logging
 import os
-from dotenv import load_dotenv
 from typing import cast
 import chainlit as cl
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel
-from agents.run import RunConfig
+from agents import Agent, Runner
+from gemini_shared import (
+    AdmissionController,
+    AdmissionRejected,
+    CoalescingStreamWriter,
+    GenerationTracker,
+    cancellation_stats,
+    get_config,
+    get_model,
+    get_session_backend,
+    stream_metrics,
+)
+from history import ChatHistory
+from session_store import SessionStore
+
+# Admission and session cache details; visible with logging set to DEBUG
+logger = logging.getLogger(__name__)
+
+# One pooled client, model and config shared by every chat session
+model = get_model()
+config = get_config()
+
+# Recent turns are sent verbatim up to this many tokens; older ones are summarized
+HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", "2000"))
+
+# Tokens are sent to the browser in batches: after this many seconds or bytes, whichever comes first
+STREAM_FLUSH_INTERVAL = float(os.getenv("STREAM_FLUSH_INTERVAL", "0.05"))
+STREAM_FLUSH_BYTES = int(os.getenv("STREAM_FLUSH_BYTES", "512"))
+
+# Generations running at once; more wait their turn, round-robin across users, up to a queue limit
+MAX_CONCURRENT_GENERATIONS = int(os.getenv("MAX_CONCURRENT_GENERATIONS", "16"))
+MAX_QUEUED_GENERATIONS = int(os.getenv("MAX_QUEUED_GENERATIONS", "64"))
+MAX_QUEUED_PER_USER = int(os.getenv("MAX_QUEUED_PER_USER", "2"))
+admission = AdmissionController(MAX_CONCURRENT_GENERATIONS, MAX_QUEUED_GENERATIONS, MAX_QUEUED_PER_USER)
+
+# Where chat histories live, shared by every worker: sqlite:///file.db or redis://host:port/db
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "sqlite:///sessions.db")
+# Histories cached in memory; idle ones beyond these limits are dropped and reloaded on return
+MAX_LIVE_SESSIONS = int(os.getenv("MAX_LIVE_SESSIONS", "1000"))
+MAX_SESSION_BYTES = int(os.getenv("MAX_SESSION_BYTES", "64000"))
+MAX_SESSIONS_BYTES = int(os.getenv("MAX_SESSIONS_BYTES", "32000000"))
+
+summarizer_agent = Agent(
+    name="Summarizer",
+    instructions=(
+        "You keep a short running summary of a conversation. Merge the new messages into the "
+        "current summary, keeping names, facts, decisions and open questions. "
+        "Reply with the updated summary only."
+    ),
+    model=model,
+)
+
+
+async def summarize(summary: str, messages: list[dict]) -> str:
+    """Fold newly evicted messages into the running summary."""
+    transcript = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+    result = await Runner.run(
+        summarizer_agent,
+        f"Current summary:\n{summary or '(empty)'}\n\nNew messages:\n{transcript}",
+        run_config=config,
+    )
+    return result.final_output
 
-# Load the environment variables from the .env file
-load_dotenv()
 
-gemini_api_key = os.getenv("GEMINI_API_KEY")
+# The agent is stateless, so every session shares one
+agent = Agent(name="Assistant", instructions="You are a helpful assistant", model=model)
 
-# Check if the API key is present; if not, raise an error
-if not gemini_api_key:
-    raise ValueError("GEMINI_API_KEY is not set. Please ensure it is defined in your .env file.")
+sessions = SessionStore(
+    lambda: ChatHistory(summarize, budget_tokens=HISTORY_TOKEN_BUDGET),
+    backend=get_session_backend(SESSION_BACKEND),
+    max_sessions=MAX_LIVE_SESSIONS,
+    max_session_bytes=MAX_SESSION_BYTES,
+    max_total_bytes=MAX_SESSIONS_BYTES,
+)
 
 
 @cl.on_chat_start
 async def start():
-    #Reference: https://ai.google.dev/gemini-api/docs/openai
-    external_client = AsyncOpenAI(
-        api_key=gemini_api_key,
-        base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-    )
-
-    model = OpenAIChatCompletionsModel(
-        model="gemini-2.0-flash",
-        openai_client=external_client
-    )
-
-    config = RunConfig(
-        model=model,
-        model_provider=external_client,
-        tracing_disabled=True
-    )
     """Set up the chat session when a user connects."""
-    # Initialize an empty chat history in the session.
-    cl.user_session.set("chat_history", [])
-
-    cl.user_session.set("config", config)
-    agent: Agent = Agent(name="Assistant", instructions="You are a helpful assistant", model=model)
-    cl.user_session.set("agent", agent)
+    # Track the answer being streamed so it can be cancelled
+    cl.user_session.set("generations", GenerationTracker())
 
     await cl.Message(content="Welcome to the Panaversity AI Assistant! How can I help you today?").send()
 
 @cl.on_message
 async def main(message: cl.Message):
     """Process incoming messages and generate responses."""
-    # Retrieve the chat history from the session.
-    history = cl.user_session.get("chat_history") or []
+    session_id = cl.context.session.id
+    # Stop this session's previous answer now, so it does not hold a slot this message waits for
+    tracker = cl.user_session.get("generations")
+    if tracker is not None:
+        tracker.cancel("superseded")
+    try:
+        # Wait for a generation slot, then check out this session's chat history for the turn.
+        async with admission.slot(session_id):
+            async with sessions.session(session_id) as history:
+                await respond(message, history)
+    except AdmissionRejected as e:
+        await cl.Message(content=f"⏳ {str(e)}").send()
+    logger.debug("admission: %s", admission.snapshot())
+    logger.debug("sessions: %s", sessions.metrics())
+
+
+async def respond(message: cl.Message, history: ChatHistory):
+    """Stream the answer to one message and record the turn in the history."""
+    tracker: GenerationTracker = cast(GenerationTracker, cl.user_session.get("generations"))
 
     # Append the user's message to the history.
     history.append({"role": "user", "content": message.content})
@@ -56,30 +117,80 @@ async def main(message: cl.Message):
     msg = cl.Message(content="")
     await msg.send()
 
-    agent: Agent = cast(Agent, cl.user_session.get("agent"))
-    config: RunConfig = cast(RunConfig, cl.user_session.get("config"))
+    # Coalesce deltas into fewer websocket frames
+    writer = CoalescingStreamWriter(msg.stream_token, max_delay=STREAM_FLUSH_INTERVAL, max_bytes=STREAM_FLUSH_BYTES)
+    generation = None
 
     try:
-        print("\n[CALLING_AGENT_WITH_CONTEXT]\n", history, "\n")
+        # Recent turns verbatim plus the rolling summary of older ones
+        context = history.window()
+        print("\n[CALLING_AGENT_WITH_CONTEXT]\n", context, "\n")
+        print(
+            f"[HISTORY] sent {history.last_turn.sent_tokens} of {history.last_turn.full_tokens} tokens, "
+            f"saved {history.last_turn.saved_tokens} this turn, {history.total_saved_tokens} this session"
+        )
         # Run the agent with streaming enabled
-        result = Runner.run_streamed(agent, history, run_config=config)
+        result = Runner.run_streamed(agent, context, run_config=config)
+        # Track this answer so a newer message or the stop button can cancel it
+        generation = tracker.start(result)
 
-        # Stream the response token by token
+        # Stream the response, batching tokens into frames
         async for event in result.stream_events():
             if event.type == "raw_response_event" and hasattr(event.data, 'delta'):
                 token = event.data.delta
-                await msg.stream_token(token)
+                generation.add(token)
+                await writer.write(token)
+        if generation.cancelled:
+            raise asyncio.CancelledError
+        await writer.aclose()
+        await msg.update()
+        print(
+            f"[STREAM] {writer.metrics.tokens_received} tokens in {writer.metrics.frames_sent} frames; "
+            f"all sessions: {stream_metrics.tokens_received} tokens in {stream_metrics.frames_sent} frames"
+        )
 
         # Append the assistant's response to the history.
-        history.append({"role": "assistant", "content": msg.content})
-
-        # Update the session with the new history.
-        cl.user_session.set("chat_history", history)
+        history.append({"role": "assistant", "content": writer.text})
 
         # Optional: Log the interaction
         print(f"User: {message.content}")
-        print(f"Assistant: {msg.content}")
+        print(f"Assistant: {writer.text}")
+
+    except asyncio.CancelledError:
+        # A newer message, a disconnect or the stop button cancelled this answer
+        writer.cancel()
+        msg.content = writer.text + "\n\n*(stopped)*"
+        await msg.update()
+        if generation is not None and generation.cancelled:
+            print(
+                f"[CANCELLED] {generation.cancel_reason} after {generation.tokens} tokens in {generation.elapsed:.1f}s; "
+                f"saved ~{generation.tokens_saved:.0f} tokens and ~{generation.seconds_saved:.1f}s "
+                f"(all sessions: ~{cancellation_stats.tokens_saved:.0f} tokens, ~{cancellation_stats.seconds_saved:.1f}s)"
+            )
 
     except Exception as e:
-        await msg.update(content=f"Error: {str(e)}")
-        print(f"Error: {str(e)}")
\ No newline at end of file
+        writer.cancel()
+        msg.content = f"Error: {str(e)}"
+        await msg.update()
+        print(f"Error: {str(e)}")
+
+    finally:
+        if generation is not None:
+            tracker.finish(generation)
+
+
+@cl.on_stop
+async def stop():
+    """Cancel the answer in flight when the user presses the stop button."""
+    tracker = cl.user_session.get("generations")
+    if tracker is not None:
+        tracker.cancel("stopped")
+
+
+@cl.on_chat_end
+async def end():
+    """Stop the answer in flight and drop the session's history from memory."""
+    tracker = cl.user_session.get("generations")
+    if tracker is not None:
+        tracker.cancel("disconnected")
+    await sessions.evict(cl.context.session.id)
\ No newline at end of file
@@ -0,0 +1,159 @@
+"""Token-budgeted chat history with a rolling summary.
+
+Sending the whole conversation on every turn makes input tokens, cost and
+latency grow linearly with the length of a chat. ``ChatHistory`` keeps the
+most recent messages verbatim within a token budget and folds older ones into
+a running summary. The summary is updated incrementally (only the newly
+evicted messages are sent to the summarizer) in a background task, so a turn
+never waits for it; until a batch is folded in, those messages are still sent
+verbatim and nothing is lost.
+"""
+
+import asyncio
+import json
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from gemini_shared import SessionSnapshot
+
+Message = dict[str, Any]
+Summarizer = Callable[[str, list[Message]], Awaitable[str]]
+SummaryListener = Callable[[str, int], Awaitable[None]]
+
+
+def count_tokens(text: str) -> int:
+    """Cheap token estimate (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+def message_tokens(message: Message) -> int:
+    return count_tokens(str(message.get("content") or "")) + 4
+
+
+@dataclass
+class TurnStats:
+    sent_tokens: int
+    """Tokens of history actually sent to the model this turn."""
+    full_tokens: int
+    """Tokens the full, untrimmed history would have cost."""
+
+    @property
+    def saved_tokens(self) -> int:
+        return self.full_tokens - self.sent_tokens
+
+
+class ChatHistory:
+    def __init__(self, summarize: Summarizer, budget_tokens: int = 2000, min_recent_messages: int = 2):
+        self.summarize = summarize
+        self.budget_tokens = budget_tokens
+        self.min_recent_messages = min_recent_messages
+        self.summary = ""
+        self.recent: list[Message] = []
+        self.full_tokens = 0
+        self.total_saved_tokens = 0
+        self.last_turn: TurnStats | None = None
+        self.total_messages = 0
+        # Number of leading messages the summary contains.
+        self.covered = 0
+        # Called with the new summary and ``covered`` whenever the summary changes.
+        self.on_summary: SummaryListener | None = None
+        # Messages evicted from the window but not folded into the summary yet.
+        self._pending: list[Message] = []
+        # Messages appended since the last take_unsaved().
+        self._unsaved: list[Message] = []
+        self._summary_task: asyncio.Task[None] | None = None
+
+    @property
+    def dropped(self) -> int:
+        """Messages after ``covered`` that are no longer held, because ``shrink()`` dropped them."""
+        return self.total_messages - self.covered - len(self._pending) - len(self.recent)
+
+    def append(self, message: Message) -> None:
+        self.recent.append(message)
+        self.full_tokens += message_tokens(message)
+        self.total_messages += 1
+        self._unsaved.append(message)
+        self._fit_budget()
+
+    def take_unsaved(self) -> list[Message]:
+        """The messages appended since the last call, for an append-only store."""
+        unsaved, self._unsaved = self._unsaved, []
+        return unsaved
+
+    def load_snapshot(self, snapshot: SessionSnapshot) -> None:
+        """Rebuild the history from a session backend's summary and log tail."""
+        self.summary = snapshot.summary
+        self.covered = snapshot.covered
+        self.recent = list(snapshot.messages)
+        self._pending = []
+        self.total_messages = snapshot.total
+        self.full_tokens = snapshot.full_tokens
+        self._fit_budget()
+
+    def _fit_budget(self) -> None:
+        recent_tokens = sum(message_tokens(m) for m in self.recent)
+        while recent_tokens > self.budget_tokens and len(self.recent) > self.min_recent_messages:
+            evicted = self.recent.pop(0)
+            recent_tokens -= message_tokens(evicted)
+            self._pending.append(evicted)
+        if self._pending and (self._summary_task is None or self._summary_task.done()):
+            self._summary_task = asyncio.create_task(self._fold_pending())
+
+    def window(self) -> list[Message]:
+        """The input to send this turn, and record its token savings."""
+        messages: list[Message] = []
+        if self.summary:
+            messages.append({"role": "system", "content": f"Summary of the earlier conversation: {self.summary}"})
+        messages.extend(self._pending)
+        messages.extend(self.recent)
+        sent = sum(message_tokens(m) for m in messages)
+        self.last_turn = TurnStats(sent_tokens=sent, full_tokens=self.full_tokens)
+        self.total_saved_tokens += self.last_turn.saved_tokens
+        return messages
+
+    def size_bytes(self) -> int:
+        """Approximate memory held by the messages and summary."""
+        return len(json.dumps([self.summary, self._pending, self.recent]).encode())
+
+    def shrink(self, max_bytes: int) -> None:
+        """Drop the oldest unsummarized, then recent, messages until under ``max_bytes``.
+
+        The dropped messages stay uncovered, so the backend still has them and
+        the next worker to load the session summarizes them.
+        """
+        while self.size_bytes() > max_bytes:
+            if self._pending:
+                self._pending.pop(0)
+            elif len(self.recent) > self.min_recent_messages:
+                self.recent.pop(0)
+            else:
+                break
+
+    async def _fold_pending(self) -> None:
+        while self._pending:
+            batch = list(self._pending)
+            # Messages dropped before this batch leave a gap the summary cannot cover.
+            contiguous = self.dropped == 0
+            try:
+                self.summary = await self.summarize(self.summary, batch)
+            except Exception as e:
+                # Keep the batch verbatim; the next eviction retries it.
+                print(f"Summary update failed: {str(e)}")
+                return
+            # shrink() may have dropped some of the batch meanwhile
+            folded = {id(m) for m in batch}
+            self._pending = [m for m in self._pending if id(m) not in folded]
+            if not contiguous:
+                # Saving this summary would skip the dropped messages; keep the stored one.
+                continue
+            self.covered += len(batch)
+            if self.on_summary is not None:
+                try:
+                    await self.on_summary(self.summary, self.covered)
+                except Exception as e:
+                    print(f"Saving the summary failed: {str(e)}")
+
+    async def aclose(self) -> None:
+        if self._summary_task is not None and not self._summary_task.done():
+            self._summary_task.cancel()
@@ -0,0 +1,157 @@
+"""Bounded cache of chat sessions in front of a shared session backend.
+
+Every turn's new messages are appended to a ``SessionBackend`` (an SQLite
+file in WAL mode or a Redis server), so several Chainlit workers can serve the
+same users. ``SessionStore`` keeps at most ``max_sessions`` histories (and
+``max_total_bytes`` of them) in memory, caps each one at
+``max_session_bytes``, and evicts the least recently used idle sessions; an
+evicted session costs nothing to drop because the backend already has it, and
+it is rehydrated from the backend when it returns. A cached history is
+reloaded if another worker has appended to the session since. Sessions that
+are handling a message are never evicted.
+"""
+
+import os
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from gemini_shared import SessionBackend
+from history import ChatHistory, message_tokens
+
+
+def rss_bytes() -> int:
+    """Current resident set size of this process (peak size where unavailable, 0 on Windows)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+@dataclass
+class StoreCounters:
+    created: int = 0
+    rehydrated: int = 0
+    reloaded: int = 0
+    """Cached sessions reloaded because another worker appended to them."""
+    evicted: int = 0
+    trimmed: int = 0
+    appended_messages: int = 0
+
+
+class SessionStore:
+    def __init__(
+        self,
+        new_history: Callable[[], ChatHistory],
+        backend: SessionBackend,
+        max_sessions: int = 1000,
+        max_session_bytes: int = 64_000,
+        max_total_bytes: int = 32_000_000,
+    ):
+        self.new_history = new_history
+        self.backend = backend
+        self.max_sessions = max_sessions
+        self.max_session_bytes = max_session_bytes
+        self.max_total_bytes = max_total_bytes
+        self.counters = StoreCounters()
+        # Least recently used first
+        self._live: OrderedDict[str, ChatHistory] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        self._in_use: dict[str, int] = {}
+        # Sessions to evict as soon as their current message is done
+        self._evict_on_release: set[str] = set()
+
+    @property
+    def live_bytes(self) -> int:
+        return sum(self._sizes.values())
+
+    @asynccontextmanager
+    async def session(self, session_id: str) -> AsyncIterator[ChatHistory]:
+        """Check out a session's history for the duration of one message."""
+        history = await self._checkout(session_id)
+        self._in_use[session_id] = self._in_use.get(session_id, 0) + 1
+        try:
+            yield history
+        finally:
+            self._in_use[session_id] -= 1
+            if not self._in_use[session_id]:
+                del self._in_use[session_id]
+            # Append only this turn's messages
+            unsaved = history.take_unsaved()
+            if unsaved:
+                await self.backend.append(session_id, unsaved, sum(message_tokens(m) for m in unsaved))
+                self.counters.appended_messages += len(unsaved)
+            self._account(session_id, history)
+            if session_id in self._evict_on_release:
+                await self.evict(session_id)
+            await self._evict_idle()
+
+    async def _checkout(self, session_id: str) -> ChatHistory:
+        cached = self._live.get(session_id)
+        if cached is not None:
+            if session_id in self._in_use or await self.backend.length(session_id) == cached.total_messages:
+                self._live.move_to_end(session_id)
+                return cached
+            await self._drop(session_id)
+            self.counters.reloaded += 1
+
+        snapshot = await self.backend.load(session_id)
+        history = self.new_history()
+        history.load_snapshot(snapshot)
+        history.on_summary = lambda summary, covered: self.backend.set_summary(session_id, summary, covered)
+        if snapshot.total:
+            self.counters.rehydrated += 1
+        else:
+            self.counters.created += 1
+        self._live[session_id] = history
+        self._account(session_id, history)
+        return history
+
+    def _account(self, session_id: str, history: ChatHistory) -> None:
+        if session_id not in self._live:
+            return
+        size = history.size_bytes()
+        if size > self.max_session_bytes:
+            history.shrink(self.max_session_bytes)
+            self.counters.trimmed += 1
+            size = history.size_bytes()
+        self._sizes[session_id] = size
+
+    async def _evict_idle(self) -> None:
+        while len(self._live) > self.max_sessions or self.live_bytes > self.max_total_bytes:
+            idle = next((sid for sid in self._live if sid not in self._in_use), None)
+            if idle is None:
+                break
+            await self.evict(idle)
+
+    async def _drop(self, session_id: str) -> None:
+        history = self._live.pop(session_id)
+        self._sizes.pop(session_id, None)
+        # Messages still waiting for the summarizer stay uncovered in the backend.
+        await history.aclose()
+
+    async def evict(self, session_id: str) -> None:
+        """Drop an idle session from memory, e.g. when its chat ends."""
+        if session_id in self._in_use:
+            self._evict_on_release.add(session_id)
+            return
+        self._evict_on_release.discard(session_id)
+        if session_id in self._live:
+            await self._drop(session_id)
+            self.counters.evicted += 1
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "live_sessions": len(self._live),
+            "live_bytes": self.live_bytes,
+            **asdict(self.counters),
+            "rss_bytes": rss_bytes(),
+        }
@@ -1,22 +1,8 @@
 import asyncio
-from openai import AsyncOpenAI
 from agents import Agent, OpenAIChatCompletionsModel, Runner, set_tracing_disabled
-import os
-from dotenv import load_dotenv
-# Load the environment variables from the .env file
-load_dotenv()
+from gemini_shared import get_client
 
-gemini_api_key = os.getenv("GEMINI_API_KEY")
-
-# Check if the API key is present; if not, raise an error
-if not gemini_api_key:
-    raise ValueError("GEMINI_API_KEY is not set. Please ensure it is defined in your .env file.")
-
-#Reference: https://ai.google.dev/gemini-api/docs/openai
-client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
+client = get_client()
 
 set_tracing_disabled(disabled=True)
 
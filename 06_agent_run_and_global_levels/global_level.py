@@ -1,23 +1,10 @@
-from agents import Agent, Runner, AsyncOpenAI, set_default_openai_client, set_tracing_disabled, set_default_openai_api
-import os
-from dotenv import load_dotenv
-# Load the environment variables from the .env file
-load_dotenv()
-
-gemini_api_key = os.getenv("GEMINI_API_KEY")
-
-# Check if the API key is present; if not, raise an error
-if not gemini_api_key:
-    raise ValueError("GEMINI_API_KEY is not set. Please ensure it is defined in your .env file.")
+from agents import Agent, Runner, set_default_openai_client, set_tracing_disabled, set_default_openai_api
+from gemini_shared import get_client
 
 set_tracing_disabled(True)
 set_default_openai_api("chat_completions")
 
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
-set_default_openai_client(external_client)
+set_default_openai_client(get_client())
 
 agent: Agent = Agent(name="Assistant", instructions="You are a helpful assistant", model="gemini-2.0-flash")
 
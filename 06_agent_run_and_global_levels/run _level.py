@@ -1,35 +1,10 @@
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel
-from agents.run import RunConfig
-import os
-from dotenv import load_dotenv
-# Load the environment variables from the .env file
-load_dotenv()
+from agents import Agent
+from gemini_shared import get_config, run_sync
 
-gemini_api_key = os.getenv("GEMINI_API_KEY")
-
-# Check if the API key is present; if not, raise an error
-if not gemini_api_key:
-    raise ValueError("GEMINI_API_KEY is not set. Please ensure it is defined in your .env file.")
-
-#Reference: https://ai.google.dev/gemini-api/docs/openai
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
-
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=external_client
-)
-
-config = RunConfig(
-    model=model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+config = get_config()
 
 agent: Agent = Agent(name="Assistant", instructions="You are a helpful assistant")
 
-result = Runner.run_sync(agent, "Hello, how are you.", run_config=config)
+result = run_sync(agent, "Hello, how are you.", run_config=config)
 
 print(result.final_output)
\ No newline at end of file
@@ -0,0 +1,50 @@
+import argparse
+import asyncio
+import json
+
+from gemini_shared import OfflineBatchRunner
+# The translators answer in a single model call, so they can go through the batch API
+from main import TRANSLATORS
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Translate a file of texts through the batch API.")
+    parser.add_argument("texts", help="text file, one message to translate per line")
+    parser.add_argument("-o", "--output", default="translations.jsonl")
+    parser.add_argument("--languages", default="spanish,french,italian")
+    parser.add_argument("--poll", type=float, default=30.0, help="seconds between status checks")
+    parser.add_argument("--batch-id", help="collect the results of a batch submitted earlier")
+    args = parser.parse_args()
+
+    with open(args.texts, encoding="utf-8") as f:
+        texts = [line.strip() for line in f if line.strip()]
+    languages = args.languages.split(",")
+    # One job per text and language; the same file and languages rebuild the same jobs
+    jobs = [(TRANSLATORS[language], text) for text in texts for language in languages]
+
+    runner = OfflineBatchRunner(poll_interval=args.poll)
+    batch_id = args.batch_id
+    if batch_id is None:
+        batch_id = (await runner.submit(jobs)).id
+        print(f"Submitted {len(jobs)} requests as batch {batch_id}")
+        print(f"If this stops, collect the results later with --batch-id {batch_id}")
+    batch = await runner.wait(batch_id)
+    print(f"Batch {batch.id} {batch.status}")
+
+    results = await runner.results(batch, jobs)
+    with open(args.output, "w", encoding="utf-8") as f:
+        for result in results:
+            record = {
+                "text": result.input,
+                "language": result.last_agent.name.removesuffix("_agent"),
+                "translation": result.final_output,
+                "error": result.error,
+            }
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    failed = sum(result.error is not None for result in results)
+    tokens = sum(result.usage.total_tokens for result in results)
+    print(f"{len(results) - failed} translated, {failed} failed, {tokens} tokens. Results in {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
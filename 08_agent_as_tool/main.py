@@ -1,80 +1,97 @@
-from agents import (
-    AsyncOpenAI,
-    OpenAIChatCompletionsModel,
-)
 import asyncio
-from agents import Agent, Runner
 import os
-from dotenv import load_dotenv
+from agents import Agent, Runner
 from agents import set_default_openai_client, set_tracing_disabled
+from gemini_shared import TranslationMemo, get_client, get_model, limit_concurrency, multiplex_tool
+from router import parse_request
 
-load_dotenv()
-gemini_api_key = os.getenv("GEMINI_API_KEY")
-if not gemini_api_key:
-    raise ValueError("GEMINI_API_KEY is not set. Please ensure it is defined in your .env file.")
+model = get_model()
 
-#Reference: https://ai.google.dev/gemini-api/docs/openai
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
+# Translations asked for in one message run at the same time, up to this many.
+MAX_PARALLEL_TRANSLATIONS = int(os.getenv("MAX_PARALLEL_TRANSLATIONS", "3"))
 
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=external_client
-)
-     
-set_default_openai_client(external_client)
+# Every finished translation, so repeated texts skip the translator's model call.
+# Opened on first use, so importing this module does not create the file.
+_memo = None
+
+
+def get_memo():
+    global _memo
+    if _memo is None:
+        _memo = TranslationMemo(os.getenv("TRANSLATION_MEMO", "translations.db"))
+    return _memo
+
+set_default_openai_client(get_client())
 set_tracing_disabled(True)
 
-spanish_agent = Agent(
-    name="spanish_agent",
-    instructions="You translate the user's message to Spanish",
-    handoff_description="An english to spanish translator",
-    model=model
-)
+# The instructions each language's translator works from. A new language needs
+# a line here and its names in router.LANGUAGE_ALIASES; the orchestrator's
+# single translate tool picks it up from TRANSLATORS.
+INSTRUCTIONS = {
+    "spanish": "You translate the user's message to Spanish",
+    "french": "You translate the user's message to French",
+    "italian": "You translate the user's message to Italian",
+}
+
+TRANSLATORS = {
+    language: Agent(
+        name=f"{language}_agent",
+        instructions=instructions,
+        handoff_description=f"An english to {language} translator",
+        model=model
+    )
+    for language, instructions in INSTRUCTIONS.items()
+}
+
+
+async def translate_with_memo(language, text):
+    return await get_memo().translate(TRANSLATORS[language], language, text)
 
-french_agent = Agent(
-    name="french_agent",
-    instructions="You translate the user's message to French",
-    handoff_description="An english to french translator",
-    model=model
-)
 
-italian_agent = Agent(
-    name="italian_agent",
-    instructions="You translate the user's message to Italian",
-    handoff_description="An english to italian translator",
-    model=model
-)
 orchestrator_agent = Agent(
     name="orchestrator_agent",
     instructions=(
-        "You are a translation agent. You use the tools given to you to translate."
-        "If asked for multiple translations, you call the relevant tools in order."
-        "You never translate on your own, you always use the provided tools."
+        "You are a translation agent. You use the translate tool to translate."
+        "If asked for multiple translations, you call the tool once per language, all at once,"
+        " in the order the languages were asked for."
+        "You never translate on your own, you always use the provided tool."
     ),
-    tools=[
-        spanish_agent.as_tool(
-            tool_name="translate_to_spanish",
-            tool_description="Translate the user's message to Spanish",
+    # One tool with a target_language argument rather than a tool per language:
+    # each new language adds a word to the orchestrator's prompt, not a tool schema
+    tools=limit_concurrency([
+        multiplex_tool(
+            TRANSLATORS,
+            tool_name="translate",
+            tool_description="Translate the user's message to the target language",
+            run=translate_with_memo,
         ),
-        french_agent.as_tool(
-            tool_name="translate_to_french",
-            tool_description="Translate the user's message to French",
-        ),
-        italian_agent.as_tool(
-            tool_name=None,
-            tool_description="Translate the user's message to Italian",
-        ),
-    ],
+    ], MAX_PARALLEL_TRANSLATIONS),
     model=model
 )
+
+
+async def translate(msg):
+    # Plain "Translate X to Spanish and French" requests skip the orchestrator's two model turns
+    request = parse_request(msg)
+    if request is None or any(language not in TRANSLATORS for language in request.languages):
+        orchestrator_result = await Runner.run(orchestrator_agent, msg)
+        return orchestrator_result.final_output
+
+    limiter = asyncio.Semaphore(MAX_PARALLEL_TRANSLATIONS)
+
+    async def run(language):
+        async with limiter:
+            translation = await translate_with_memo(language, request.text)
+        return f"{language.title()}: {translation}"
+
+    return "\n".join(await asyncio.gather(*(run(language) for language in request.languages)))
+
+
 async def main():
     msg = input("Hi! What would you like translated, and to which languages? ")
 
-    orchestrator_result = await Runner.run(orchestrator_agent, msg)
-    print(f"\n\nFinal response:\n{orchestrator_result.final_output}")
+    final_output = await translate(msg)
+    print(f"\n\nFinal response:\n{final_output}")
 
     
 if __name__ == "__main__":
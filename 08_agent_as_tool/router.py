@@ -0,0 +1,96 @@
+"""Work out locally which translations a message asks for.
+
+Most requests look like "Translate 'good morning' to Spanish and French".
+For those, asking the orchestrator which tools to call costs a model round
+trip, and so does its closing summary. ``parse_request`` reads the text and
+the target languages straight from the message. It returns ``None``
+whenever it is not sure, and then the orchestrator handles the message as
+before. That covers an unknown language, a language list with other words in
+it, and a message in any other form.
+"""
+
+import re
+from dataclasses import dataclass
+
+# Every way of naming a language that the router accepts, lower case.
+LANGUAGE_ALIASES = {
+    "spanish": ["spanish", "español", "espanol", "castilian"],
+    "french": ["french", "français", "francais"],
+    "italian": ["italian", "italiano"],
+}
+
+ALIASES = {alias: language for language, aliases in LANGUAGE_ALIASES.items() for alias in aliases}
+
+# Words allowed between language names: "Spanish, French and also into Italian".
+CONNECTIVES = {"and", "or", "&", "plus", "both", "also", "as", "well", "in", "into", "to"}
+
+REQUEST = re.compile(
+    r"^(?:(?:please|can you|could you)\s+)*(?:translate|say)\s+(?P<rest>.+)$",
+    re.IGNORECASE | re.DOTALL,
+)
+# "Translate to <languages>: <text>"
+LANGUAGES_FIRST = re.compile(
+    r"^(?:this\s+|the following\s+)?(?:in|into|to)\s+(?P<languages>[^:]+):\s*(?P<text>.+)$",
+    re.IGNORECASE | re.DOTALL,
+)
+# Where "<text> to <languages>" could be split.
+SPLIT = re.compile(r"\s+(?:in|into|to)\s+", re.IGNORECASE)
+
+QUOTES = {'"': '"', "'": "'", "“": "”", "‘": "’"}
+
+
+@dataclass
+class TranslationRequest:
+    text: str
+    languages: list[str]
+
+
+def parse_languages(words: str) -> list[str] | None:
+    """The languages named in ``words``, in order, or ``None`` if anything else is there."""
+    languages = []
+    for word in re.split(r"[\s,/;.!?]+", words.strip().casefold()):
+        if not word or word in CONNECTIVES:
+            continue
+        language = ALIASES.get(word)
+        if language is None:
+            return None
+        if language not in languages:
+            languages.append(language)
+    return languages or None
+
+
+def quoted(text: str) -> bool:
+    return len(text) >= 2 and QUOTES.get(text[0]) == text[-1]
+
+
+def parse_request(message: str) -> TranslationRequest | None:
+    """The text and target languages of a plain translation request, else ``None``."""
+    match = REQUEST.match(message.strip())
+    if match is None:
+        return None
+    rest = match["rest"]
+    first = LANGUAGES_FIRST.match(rest)
+    if first is not None:
+        languages = parse_languages(first["languages"])
+        return TranslationRequest(unquote(first["text"]), languages) if languages else None
+
+    # Every split whose tail is only language names, e.g. "go home" / "Spanish"
+    # but not "I want" / "go home to Spanish".
+    candidates = []
+    for split in SPLIT.finditer(rest):
+        text, languages = rest[: split.start()].strip(), parse_languages(rest[split.end() :])
+        if text and languages:
+            candidates.append((text, languages))
+    # A quoted text settles where it ends.
+    if any(quoted(text) for text, _ in candidates):
+        candidates = [(text, languages) for text, languages in candidates if quoted(text)]
+    # "the word in Italian to French" could mean two things: let the model decide.
+    if len(candidates) != 1:
+        return None
+    text, languages = candidates[0]
+    return TranslationRequest(unquote(text), languages)
+
+
+def unquote(text: str) -> str:
+    text = text.strip()
+    return text[1:-1].strip() if quoted(text) else text
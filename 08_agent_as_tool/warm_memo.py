@@ -0,0 +1,18 @@
+import argparse
+
+from main import TRANSLATORS, get_memo
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load known translations into the translation memo.")
+    parser.add_argument("csv", help="CSV file with text,language,translation columns")
+    args = parser.parse_args()
+
+    memo = get_memo()
+    loaded = memo.load_csv(args.csv, TRANSLATORS)
+    print(f"Loaded {loaded} translations into the memo")
+    memo.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,34 +1,9 @@
 import asyncio
-from agents import Agent, RunConfig,AsyncOpenAI,OpenAIChatCompletionsModel, Runner
-from dotenv import load_dotenv
-import os
+from agents import Agent, Runner
+from gemini_shared import get_config
 
-# Load environment variables
-load_dotenv()
-
-# Get Gemini API Key from .env
-gemini_api_key = os.getenv("GEMINI_API_KEY")
-if not gemini_api_key:
-    raise ValueError("GEMINI_API_KEY is not set. Please check your .env file.")
-
-# Create OpenAI-compatible Gemini client
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-
-# Create model object
-model = OpenAIChatCompletionsModel(
-    model="gemini-1.5-flash",
-    openai_client=external_client
-)
-
-# Create config for running the agent
-config = RunConfig(
-    model=model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+# Shared, pooled Gemini client and config
+config = get_config("gemini-1.5-flash")
 
 # Step 1: Define a basic agent with a custom system prompt
 agent = Agent(
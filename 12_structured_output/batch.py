@@ -0,0 +1,44 @@
+import argparse
+import os
+
+from agents import Agent
+from pydantic import BaseModel
+from gemini_shared import run_sharded
+
+
+class weather_structered(BaseModel):
+    location: str
+    temperature_c: float
+    summary: str
+
+
+def make_agent() -> Agent:
+    # Built inside every worker process, so it has to live at module level
+    return Agent(
+        name="Weather Extractor",
+        instructions="Extract the location, the temperature in °C and a one-line summary from the weather report.",
+        output_type=weather_structered,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Turn a JSONL file of weather reports into structured results.")
+    parser.add_argument("reports", help="JSONL file: one report string or {\"id\": ..., \"prompt\": ...} per line")
+    parser.add_argument("-o", "--output", default="weather.jsonl")
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    parser.add_argument("--concurrency", type=int, default=16, help="runs in flight per process")
+    parser.add_argument("--rpm", type=float, default=15)
+    parser.add_argument("--tpm", type=float, default=1_000_000)
+    args = parser.parse_args()
+
+    # Parsing and validating the structured outputs is spread over all the worker processes
+    summary = run_sharded(
+        make_agent,
+        args.reports,
+        args.output,
+        processes=args.processes,
+        concurrency=args.concurrency,
+        rpm=args.rpm,
+        tpm=args.tpm,
+    )
+    print(f"{summary.succeeded} done, {summary.failed} failed, {summary.skipped} skipped in {summary.seconds:.1f}s")
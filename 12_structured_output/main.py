@@ -1,36 +1,10 @@
-import os
-from dotenv import load_dotenv
-from agents import Agent, Runner, function_tool, AsyncOpenAI, OpenAIChatCompletionsModel
-from agents.run import RunConfig
+from agents import Agent, Runner
 import asyncio
-import requests
 from pydantic import BaseModel
+from gemini_shared import function_tool, get_config, get_model, get_weather_client, single_flight
 
-# Load the environment variables from the .env file
-load_dotenv()
-
-gemini_api_key = os.getenv("GEMINI_API_KEY")
-
-# Check if the API key is present; if not, raise an error
-if not gemini_api_key:
-    raise ValueError("GEMINI_API_KEY is not set. Please ensure it is defined in your .env file.")
-
-#Reference: https://ai.google.dev/gemini-api/docs/openai
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
-
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=external_client
-)
-
-config = RunConfig(
-    model=model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+model = get_model()
+config = get_config()
 
 class weather_structered(BaseModel):
     location: str
@@ -39,11 +13,11 @@ class weather_structered(BaseModel):
      
 
 @function_tool
-def get_weather(city:str) -> str :
+@single_flight
+async def get_weather(city:str) -> str :
     """ Get the current weather for a given city."""
-    result = requests.get("http://api.weatherapi.com/v1/current.json?key=8e3aca2b91dc4342a1162608252604&q={city}")
-    data = result.json()
-    return f"The current weather in {city} is {data['current']['temp_c']}°C with {data['current']['condition']['text']}."
+    data = await get_weather_client().current(city)
+    return f"The current weather in {city} is {data['temp_c']}°C with {data['condition']['text']}."
 
 async def main():
     agent = Agent(
@@ -10,39 +10,13 @@ from agents import (
     TResponseInputItem,
     input_guardrail,
     output_guardrail,
-    AsyncOpenAI,OpenAIChatCompletionsModel,RunConfig,set_tracing_disabled
+    set_tracing_disabled
 )
-from dotenv import load_dotenv
-import os
 import asyncio
+from gemini_shared import get_config
 
-# Load environment variables
-load_dotenv()
-
-
-# Get Gemini API Key from .env
-gemini_api_key = os.getenv("GEMINI_API_KEY")
-if not gemini_api_key:
-    raise ValueError("GEMINI_API_KEY is not set. Please check your .env file.")
-
-# Create OpenAI-compatible Gemini client
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-
-# Create model object
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=external_client
-)
-
-# Create config for running the agent
-config = RunConfig(
-    model=model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+# Shared, pooled Gemini client and config
+config = get_config()
 
 set_tracing_disabled(disabled=True)  # Disable tracing for cleaner output
 
@@ -2,33 +2,12 @@
 import asyncio
 import random
 from typing import Any
-from dotenv import load_dotenv
-import os
-from agents import Agent,AsyncOpenAI,OpenAIChatCompletionsModel,RunConfig, RunContextWrapper, RunHooks, Runner, Tool, Usage, function_tool
+from agents import Agent, RunContextWrapper, RunHooks, Runner, Tool, Usage
+from gemini_shared import function_tool, get_config, get_model
 
-load_dotenv()
-
-gemini_api_key = os.getenv("GEMINI_API_KEY")
-if not gemini_api_key:
-    raise ValueError("GEMINI_API_KEY is not set in the environment variables.")
-
-# Gemini client setup
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-
-# Gemini-compatible model
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=external_client
-)
-
-# RunConfig without model_provider
-config = RunConfig(
-    model=model,
-    tracing_disabled=True
-)
+# Shared, pooled Gemini model and config
+model = get_model()
+config = get_config()
 
 class ExampleHooks(RunHooks):
     def __init__(self):
@@ -75,13 +54,14 @@ class ExampleHooks(RunHooks):
 hooks = ExampleHooks()
 
 
-@function_tool("random_number")
+# Sync tools run in their own small thread pool instead of on the event loop
+@function_tool(name_override="random_number", workers=2)
 def random_number(max: int) -> int:
     """Generate a random number up to the provided max."""
     return random.randint(0, max)
 
 
-@function_tool("multiply_by_two")
+@function_tool(name_override="multiply_by_two", workers=2)
 def multiply_by_two(x: int) -> int:
     """Return x times two."""
     return x * 2
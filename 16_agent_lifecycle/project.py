@@ -1,5 +1,4 @@
 import asyncio
-import os
 from typing import Any
 from pydantic import BaseModel
 from agents import (
@@ -8,37 +7,12 @@ from agents import (
     RunContextWrapper,
     Runner,
     Tool,
-    function_tool,
-    RunConfig,
-    AsyncOpenAI,
-    OpenAIChatCompletionsModel,
-    set_default_openai_client,
-    set_tracing_disabled,
 )
-from dotenv import load_dotenv
+from gemini_shared import function_tool, get_config, get_model
 
-# Load environment variables
-load_dotenv()
-gemini_api_key = os.getenv("GEMINI_API_KEY")
-if not gemini_api_key:
-    raise ValueError("GEMINI_API_KEY not found in .env file!")
-
-# Gemini Client Setup
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=external_client
-)
-
-config = RunConfig(
-    model=model,
-    model_provider=external_client,
-    tracing_disabled=True
-)
+# Shared, pooled Gemini model and config
+model = get_model()
+config = get_config()
 
 # Pydantic model for task output
 class TaskOutput(BaseModel):
@@ -61,14 +35,14 @@ class TaskManagerHook(AgentHooks):
         self.step_count += 1
         print(f"🎯 {self.agent_name} Step {self.step_count}: {agent.name} khatam, Output: {output}")
 
-# Tools
-@function_tool
+# Tools (sync, so function_tool runs them in a thread pool, off the event loop)
+@function_tool(timeout=10)
 def create_task(description: str, assigned_to: str) -> str:
     """Create a new task with a unique ID."""
     task_id = f"TASK-{hash(description + assigned_to) % 1000}"
     return f"Task {task_id} created for {assigned_to}: {description}"
 
-@function_tool
+@function_tool(timeout=10)
 def check_status(task_id: str) -> str:
     """Check the status of a task (simulated)."""
     return f"Task {task_id} status: In Progress"  # Dummy response
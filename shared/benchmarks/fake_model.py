@@ -0,0 +1,104 @@
+"""An in-process ``Model`` that answers instantly, for measuring SDK overhead.
+
+No HTTP, no JSON parsing of provider payloads: whatever time a run takes with
+this model is spent in the Agents SDK itself (turn loop, hook dispatch, schema
+handling, item conversion).
+
+The reply is chosen from what the agent offers:
+
+* a handoff, if the agent has handoffs and none has happened yet in this run;
+* otherwise a call to the first tool, if the agent has tools and has not
+  received a tool result yet;
+* otherwise ``final_output`` as an assistant message.
+"""
+
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+from agents import Handoff, Model, ModelResponse, ModelSettings, Tool, Usage
+from agents.agent_output import AgentOutputSchemaBase
+from agents.models.interface import ModelTracing
+from openai.types.responses import (
+    Response,
+    ResponseCompletedEvent,
+    ResponseFunctionToolCall,
+    ResponseOutputMessage,
+    ResponseOutputText,
+)
+
+
+class FakeModel(Model):
+    def __init__(self, final_output: str = "Islamabad", tool_arguments: str = "{}"):
+        self.final_output = final_output
+        self.tool_arguments = tool_arguments
+        self.calls = 0
+
+    def _output(
+        self, input: str | list[Any], tools: list[Tool], handoffs: list[Handoff]
+    ) -> list[ResponseOutputMessage | ResponseFunctionToolCall]:
+        self.calls += 1
+        answered = not isinstance(input, str) and any(
+            isinstance(item, dict) and item.get("type") == "function_call_output" for item in input
+        )
+        if not answered and (handoffs or tools):
+            name = handoffs[0].tool_name if handoffs else tools[0].name
+            arguments = "{}" if handoffs else self.tool_arguments
+            return [
+                ResponseFunctionToolCall(
+                    id=f"fc_{self.calls}",
+                    call_id=f"call_{self.calls}",
+                    type="function_call",
+                    name=name,
+                    arguments=arguments,
+                )
+            ]
+        return [
+            ResponseOutputMessage(
+                id=f"msg_{self.calls}",
+                type="message",
+                role="assistant",
+                status="completed",
+                content=[ResponseOutputText(type="output_text", text=self.final_output, annotations=[])],
+            )
+        ]
+
+    async def get_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[Any],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        **kwargs: Any,
+    ) -> ModelResponse:
+        return ModelResponse(
+            output=self._output(input, tools, handoffs),
+            usage=Usage(requests=1, input_tokens=10, output_tokens=5, total_tokens=15),
+            response_id=None,
+        )
+
+    async def stream_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[Any],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        **kwargs: Any,
+    ) -> AsyncIterator[Any]:
+        response = Response(
+            id="resp_fake",
+            created_at=time.time(),
+            model="fake",
+            object="response",
+            output=self._output(input, tools, handoffs),
+            tool_choice="auto",
+            tools=[],
+            parallel_tool_calls=False,
+        )
+        yield ResponseCompletedEvent(type="response.completed", response=response, sequence_number=0)
@@ -0,0 +1,200 @@
+"""Load test for the lesson topologies against the fake chat-completions server.
+
+Run from the ``shared`` directory:
+
+    uv run python -m benchmarks.loadtest --concurrency 1,8,32 --requests 200 --latency 0.05
+
+Every topology in ``benchmarks.topologies`` is driven by ``--concurrency``
+workers until ``--requests`` runs have finished, and the harness reports
+throughput, p50/p95/p99 latency, model round trips per request and tokens per
+second. By default the fake server runs in-process; pass ``--base-url`` to
+use one started separately with ``python -m gemini_shared.fake_server`` so it
+does not share a CPU with the clients. ``--capacity`` makes the fake server
+answer 429 above that many concurrent requests, and ``--adaptive`` wraps the
+model in ``AdaptiveModel`` to see how it copes.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import httpx
+from agents import AsyncOpenAI, OpenAIChatCompletionsModel, RunConfig, Runner
+
+from gemini_shared.adaptive import AdaptiveModel
+from gemini_shared.client import build_http_client
+from gemini_shared.fake_server import FakeChatServer, FakeServerConfig
+
+from .topologies import TOPOLOGIES, Topology
+
+
+@dataclass
+class LoadResult:
+    topology: str
+    concurrency: int
+    requests: int
+    errors: int
+    seconds: float
+    throughput: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    round_trips_per_request: float
+    tokens_per_second: float
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+async def fetch_stats(base_url: str) -> dict[str, Any]:
+    async with httpx.AsyncClient() as client:
+        response = await client.get(base_url + "stats")
+        return response.json()
+
+
+async def run_one(topology: Topology, config: RunConfig, stream: bool) -> None:
+    if stream:
+        result = Runner.run_streamed(topology.agent, topology.input, run_config=config)
+        async for _ in result.stream_events():
+            pass
+    else:
+        await Runner.run(topology.agent, topology.input, run_config=config)
+
+
+async def drive(
+    topology: Topology, config: RunConfig, concurrency: int, total: int, stream: bool
+) -> tuple[list[float], int, float]:
+    latencies: list[float] = []
+    errors = 0
+    remaining = total
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                await run_one(topology, config, stream)
+            except Exception:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+async def load_test(
+    base_url: str,
+    topology_names: list[str],
+    levels: list[int],
+    total: int,
+    stream: bool,
+    server: FakeChatServer | None = None,
+    adaptive: bool = False,
+) -> list[LoadResult]:
+    client = AsyncOpenAI(api_key="fake", base_url=base_url, http_client=build_http_client(), max_retries=0)
+    model = OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=client)
+    if adaptive:
+        model = AdaptiveModel(model)
+    config = RunConfig(model=model, tracing_disabled=True)
+
+    async def stats() -> dict[str, Any]:
+        return server.stats.as_dict() if server is not None else await fetch_stats(base_url)
+
+    results = []
+    for name in topology_names:
+        topology = TOPOLOGIES[name](model, config)
+        # Warm the connection pool so the first level does not pay for it.
+        await run_one(topology, config, stream)
+        for concurrency in levels:
+            before = await stats()
+            latencies, errors, seconds = await drive(topology, config, concurrency, total, stream)
+            after = await stats()
+            latencies.sort()
+            round_trips = after["requests"] - before["requests"]
+            tokens = (after["prompt_tokens"] + after["completion_tokens"]) - (
+                before["prompt_tokens"] + before["completion_tokens"]
+            )
+            results.append(
+                LoadResult(
+                    topology=name,
+                    concurrency=concurrency,
+                    requests=total,
+                    errors=errors,
+                    seconds=seconds,
+                    throughput=len(latencies) / seconds,
+                    p50_ms=percentile(latencies, 50) * 1000,
+                    p95_ms=percentile(latencies, 95) * 1000,
+                    p99_ms=percentile(latencies, 99) * 1000,
+                    round_trips_per_request=round_trips / total,
+                    tokens_per_second=tokens / seconds,
+                )
+            )
+            print_row(results[-1])
+    if isinstance(model, AdaptiveModel):
+        print(f"adaptive model: {model.snapshot()}")
+    await client.close()
+    return results
+
+
+HEADER = f"{'topology':<18}{'conc':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'trips':>8}{'tok/s':>10}{'errors':>8}"
+
+
+def print_row(result: LoadResult) -> None:
+    print(
+        f"{result.topology:<18}{result.concurrency:>6}{result.throughput:>10.1f}{result.p50_ms:>10.1f}"
+        f"{result.p95_ms:>10.1f}{result.p99_ms:>10.1f}{result.round_trips_per_request:>8.2f}"
+        f"{result.tokens_per_second:>10.0f}{result.errors:>8}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the lesson agent topologies against the fake model.")
+    parser.add_argument("--topology", action="append", choices=sorted(TOPOLOGIES), help="repeatable; default all")
+    parser.add_argument("--concurrency", default="1,8,32", help="comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=100, help="runs per topology and concurrency level")
+    parser.add_argument("--stream", action="store_true", help="use Runner.run_streamed instead of Runner.run")
+    parser.add_argument("--base-url", help="use an already running fake server instead of an in-process one")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--token-rate", type=float, default=0.0)
+    parser.add_argument("--capacity", type=int, default=0, help="fake server 429s above this concurrency")
+    parser.add_argument("--adaptive", action="store_true", help="wrap the model in AdaptiveModel")
+    parser.add_argument("--json", dest="json_path", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    topology_names = args.topology or list(TOPOLOGIES)
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    print(HEADER)
+    if args.base_url:
+        results = await load_test(
+            args.base_url, topology_names, levels, args.requests, args.stream, adaptive=args.adaptive
+        )
+    else:
+        config = FakeServerConfig(
+            latency=args.latency, jitter=args.jitter, token_rate=args.token_rate, capacity=args.capacity, retry_after=0
+        )
+        async with FakeChatServer(config) as server:
+            results = await load_test(
+                server.base_url, topology_names, levels, args.requests, args.stream, server, args.adaptive
+            )
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump([asdict(result) for result in results], f, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,266 @@
+"""Microbenchmark of Agents SDK overhead per turn, tool call and handoff.
+
+Runs ``Runner.run``, ``Runner.run_sync`` and ``Runner.run_streamed`` against
+``FakeModel``, which answers instantly, so the numbers are pure framework
+cost. Run from the ``shared`` directory:
+
+    uv run python -m benchmarks.overhead                    # compare with the baseline
+    uv run python -m benchmarks.overhead --update-baseline  # store new numbers
+
+For every mode it reports CPU time, peak traced memory and the memory blocks
+left allocated per run for four scenarios, and derives the cost of one extra
+turn, tool call, handoff and structured-output validation from their
+differences. A derived cost that comes out below zero is within measurement
+noise; it is shown as 0 and flagged. The command exits with status 1 when
+CPU time per run regresses more than ``--threshold`` against the baseline.
+
+Reference baselines are committed under ``baselines/``, one per interpreter
+and CPU architecture, e.g. ``overhead-cpython-3.13-x86_64.json``, along with
+the CPU model and SDK version they were measured on. With no baseline for
+this interpreter and architecture the command exits with status 2 rather
+than writing one; record it with ``--update-baseline`` and commit the file.
+The SDK version may differ, since comparing across an upgrade is the point.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from agents import Agent, RunConfig, Runner, __version__ as agents_version
+
+from .fake_model import FakeModel
+from .topologies import WeatherStructured, get_weather
+
+BASELINE_DIR = Path(__file__).with_name("baselines")
+MODES = ("run", "run_sync", "run_streamed")
+# Runs traced for peak memory and leftover blocks.
+TRACED_RUNS = 10
+
+
+@dataclass
+class Scenario:
+    name: str
+    agent: Agent[Any]
+    input: str
+
+
+def build_scenarios() -> list[Scenario]:
+    text_model = FakeModel()
+    tool_model = FakeModel(tool_arguments='{"city": "lahore"}')
+    json_model = FakeModel(final_output='{"location": "lahore", "temperature_c": 31.0, "summary": "Sunny"}')
+    python_agent = Agent(name="expert python agent", instructions="you are a expert python agent", model=text_model)
+    next_agent = Agent(name="expert next.js agent", instructions="you are a expert next.js agent", model=text_model)
+    return [
+        # one model turn
+        Scenario("turn", Agent(name="Simple Agent", instructions="Answer questions.", model=text_model), "hi"),
+        # two turns and one tool call
+        Scenario(
+            "tool_call",
+            Agent(name="Assistant", instructions="Use tools.", model=tool_model, tools=[get_weather]),
+            "what is the weather in lahore",
+        ),
+        # two turns and one handoff
+        Scenario(
+            "handoff",
+            Agent(name="main agent", instructions="Hand off.", model=text_model, handoffs=[python_agent, next_agent]),
+            "how to create next.js app",
+        ),
+        # one turn whose output is validated against a pydantic schema
+        Scenario(
+            "structured",
+            Agent(name="Assistant", instructions="Answer.", model=json_model, output_type=WeatherStructured),
+            "what is the weather in lahore",
+        ),
+    ]
+
+
+async def run_async(scenario: Scenario, config: RunConfig, mode: str, iterations: int) -> None:
+    for _ in range(iterations):
+        if mode == "run":
+            await Runner.run(scenario.agent, scenario.input, run_config=config)
+        else:
+            result = Runner.run_streamed(scenario.agent, scenario.input, run_config=config)
+            async for _ in result.stream_events():
+                pass
+
+
+def batch_runner(scenario: Scenario, config: RunConfig, mode: str) -> Callable[[int], None]:
+    if mode == "run_sync":
+
+        def run_sync_batch(iterations: int) -> None:
+            for _ in range(iterations):
+                Runner.run_sync(scenario.agent, scenario.input, run_config=config)
+
+        return run_sync_batch
+
+    loop = asyncio.new_event_loop()
+
+    def run_async_batch(iterations: int) -> None:
+        loop.run_until_complete(run_async(scenario, config, mode, iterations))
+
+    return run_async_batch
+
+
+def measure(scenario: Scenario, mode: str, iterations: int, warmup: int, repeat: int) -> dict[str, float]:
+    config = RunConfig(tracing_disabled=True)
+    batch = batch_runner(scenario, config, mode)
+    batch(warmup)
+
+    # Like timeit, keep the best of several batches to filter out noise.
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.process_time()
+        batch(iterations)
+        timings.append((time.process_time() - started) / iterations * 1e6)
+    cpu_us = min(timings)
+
+    # Leave the snapshots themselves out of the block counts.
+    ignore_tracemalloc = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot().filter_traces(ignore_tracemalloc)
+    baseline, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    batch(TRACED_RUNS)
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot().filter_traces(ignore_tracemalloc)
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    return {
+        "cpu_us": round(cpu_us, 1),
+        "peak_kib": round((peak - baseline) / 1024, 1),
+        "blocks": round(blocks / TRACED_RUNS, 1),
+    }
+
+
+def derived(results: dict[str, dict[str, float]]) -> dict[str, float]:
+    """Cost of one unit of each kind of work, from the scenario differences.
+
+    A difference can come out negative when the work costs less than the
+    noise between scenarios; those are left negative here for ``format_derived``.
+    """
+    turn = results["turn"]["cpu_us"]
+    return {
+        "per_turn": turn,
+        "per_tool_call": results["tool_call"]["cpu_us"] - 2 * turn,
+        "per_handoff": results["handoff"]["cpu_us"] - 2 * turn,
+        "per_structured_output": results["structured"]["cpu_us"] - turn,
+    }
+
+
+def format_derived(costs: dict[str, float]) -> str:
+    parts = [
+        f"{key} {value:.1f} us" if value >= 0 else f"{key} 0.0 us (within noise, measured {value:.1f})"
+        for key, value in costs.items()
+    ]
+    return ", ".join(parts)
+
+
+def cpu_model() -> str:
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or "unknown"
+
+
+def baseline_path() -> Path:
+    """The committed baseline for this interpreter and CPU architecture."""
+    version = ".".join(platform.python_version_tuple()[:2])
+    key = f"{platform.python_implementation().lower()}-{version}-{platform.machine().lower()}"
+    return BASELINE_DIR / f"overhead-{key}.json"
+
+
+def environment() -> dict[str, str]:
+    """What a baseline was measured on."""
+    return {
+        "python": f"{platform.python_implementation()} {platform.python_version()}",
+        "cpu": f"{platform.machine()} {cpu_model()}",
+        "openai_agents": agents_version,
+    }
+
+
+def write_baseline(path: Path, results: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({"environment": environment(), "results": results}, indent=2) + "\n")
+    print(f"Baseline written to {path}")
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[str]:
+    regressions = []
+    for mode, scenarios in results.items():
+        for name, numbers in scenarios.items():
+            before = baseline.get(mode, {}).get(name)
+            if before and numbers["cpu_us"] > before["cpu_us"] * (1 + threshold):
+                regressions.append(
+                    f"{mode}/{name}: {numbers['cpu_us']:.1f} us vs baseline {before['cpu_us']:.1f} us "
+                    f"(+{numbers['cpu_us'] / before['cpu_us'] - 1:.0%})"
+                )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure Agents SDK overhead with an instant fake model.")
+    parser.add_argument("--iterations", type=int, default=200, help="runs per timed batch")
+    parser.add_argument("--repeat", type=int, default=5, help="timed batches; the fastest one is kept")
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--mode", action="append", choices=MODES, help="repeatable; default all")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed CPU regression, 0.2 = 20%%")
+    parser.add_argument("--baseline", type=Path, help="default: baselines/ entry for this interpreter and CPU")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    path = args.baseline or baseline_path()
+    results: dict[str, Any] = {}
+    print(f"{'mode':<14}{'scenario':<12}{'cpu us/run':>12}{'peak KiB':>10}{'blocks/run':>12}")
+    for mode in args.mode or MODES:
+        results[mode] = {}
+        for scenario in build_scenarios():
+            numbers = measure(scenario, mode, args.iterations, args.warmup, args.repeat)
+            results[mode][scenario.name] = numbers
+            print(
+                f"{mode:<14}{scenario.name:<12}{numbers['cpu_us']:>12.1f}{numbers['peak_kib']:>10.1f}"
+                f"{numbers['blocks']:>12.1f}"
+            )
+        print("  " + format_derived(derived(results[mode])))
+
+    if args.update_baseline:
+        write_baseline(path, results)
+        return
+    if not path.exists():
+        print(
+            f"ERROR: no overhead baseline at {path}, so nothing was compared. "
+            "Record one with --update-baseline and commit it.",
+            file=sys.stderr,
+        )
+        sys.exit(2)
+
+    baseline = json.loads(path.read_text())
+    measured_on = baseline.get("environment", {})
+    current = environment()
+    if measured_on.get("cpu") != current["cpu"]:
+        print(f"Baseline measured on {measured_on.get('cpu', 'an unknown CPU')!r}, this run on {current['cpu']!r}.")
+    if measured_on.get("openai_agents") != current["openai_agents"]:
+        print(f"Comparing openai-agents {current['openai_agents']} with baseline {measured_on.get('openai_agents')}.")
+    regressions = compare(results, baseline["results"], args.threshold)
+    if regressions:
+        print("Regressions:")
+        for regression in regressions:
+            print("  " + regression)
+        sys.exit(1)
+    print(f"No regression above {args.threshold:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Calls per second of the ways sync code can run an agent.
+
+Run from the ``shared`` directory:
+
+    uv run python -m benchmarks.sync_calls --calls 200 --threads 8 --latency 0.01
+
+Each mode makes ``--calls`` single-turn runs against the fake server, first
+from the main thread one after another, then spread over ``--threads``
+threads:
+
+* ``asyncio_run``: ``asyncio.run(Runner.run(...))`` per call with a client
+  built for that call, since a pooled client cannot outlive its loop;
+* ``runner_run_sync``: ``Runner.run_sync`` with one client (main thread
+  only, it has no loop to use in other threads);
+* ``shared_loop``: ``gemini_shared.run_sync``, one background loop and one
+  warm client for every call.
+
+The fake server runs on its own background loop unless ``--base-url`` points
+at one started separately. Connections to it are plain local TCP, so against
+the real API (TLS, a real network) the per-call setup costs more than here.
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, RunConfig, Runner
+
+from gemini_shared.client import build_http_client
+from gemini_shared.fake_server import FakeChatServer, FakeServerConfig
+from gemini_shared.loop import BackgroundLoop
+from gemini_shared.sync_runner import run_sync
+
+INPUT = "Hello, how are you."
+CONFIG = RunConfig(tracing_disabled=True)
+
+
+def make_client(base_url: str) -> AsyncOpenAI:
+    return AsyncOpenAI(api_key="fake", base_url=base_url, http_client=build_http_client())
+
+
+def make_agent(client: AsyncOpenAI) -> Agent:
+    return Agent(
+        name="Assistant",
+        instructions="You are a helpful assistant",
+        model=OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=client),
+    )
+
+
+def asyncio_run_mode(base_url: str) -> Callable[[], object]:
+    async def one_call() -> object:
+        client = make_client(base_url)
+        try:
+            return await Runner.run(make_agent(client), INPUT, run_config=CONFIG)
+        finally:
+            await client.close()
+
+    return lambda: asyncio.run(one_call())
+
+
+def runner_run_sync_mode(base_url: str) -> Callable[[], object]:
+    # asyncio.run leaves the main thread without a loop, and run_sync would then fail.
+    asyncio.set_event_loop(asyncio.new_event_loop())
+    agent = make_agent(make_client(base_url))
+    return lambda: Runner.run_sync(agent, INPUT, run_config=CONFIG)
+
+
+def shared_loop_mode(base_url: str) -> Callable[[], object]:
+    agent = make_agent(make_client(base_url))
+    return lambda: run_sync(agent, INPUT, run_config=CONFIG)
+
+
+MODES = {
+    "asyncio_run": asyncio_run_mode,
+    "runner_run_sync": runner_run_sync_mode,
+    "shared_loop": shared_loop_mode,
+}
+
+
+def calls_per_second(call: Callable[[], object], calls: int, threads: int) -> float | None:
+    started = time.perf_counter()
+    if threads == 1:
+        for _ in range(calls):
+            call()
+    else:
+        with ThreadPoolExecutor(threads) as pool:
+            try:
+                for future in [pool.submit(call) for _ in range(calls)]:
+                    future.result()
+            except RuntimeError:
+                # Runner.run_sync: "There is no current event loop in thread ..."
+                return None
+    return calls / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare sync ways of calling Runner.run.")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.0, help="fake server latency per request, in seconds")
+    parser.add_argument("--base-url", help="use a fake server that is already running")
+    args = parser.parse_args()
+
+    server_loop = None
+    base_url = args.base_url
+    if base_url is None:
+        server_loop = BackgroundLoop(name="fake-server")
+        server = FakeChatServer(FakeServerConfig(latency=args.latency))
+        server_loop.run(server.start())
+        base_url = server.base_url
+
+    print(f"{'mode':<18}{'1 thread':>14}{f'{args.threads} threads':>14}")
+    for name, build in MODES.items():
+        call = build(base_url)
+        for _ in range(args.warmup):
+            call()
+        sequential = calls_per_second(call, args.calls, 1)
+        threaded = calls_per_second(call, args.calls, args.threads)
+        threaded_text = f"{threaded:>8.1f} /s" if threaded is not None else "n/a".rjust(10)
+        print(f"{name:<18}{sequential:>9.1f} /s{threaded_text:>14}")
+
+    if server_loop is not None:
+        server_loop.run(server.stop())
+        server_loop.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""The agent topologies from the lessons, rebuilt against an injected model.
+
+The lesson scripts run their agents at import time, so they cannot be imported
+by a benchmark. Each builder below mirrors the agents, tools and guardrails of
+one lesson, but takes the model and run config as arguments so it can be
+pointed at the fake server.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from agents import (
+    Agent,
+    GuardrailFunctionOutput,
+    Model,
+    RunConfig,
+    RunContextWrapper,
+    Runner,
+    TResponseInputItem,
+    function_tool,
+    input_guardrail,
+    output_guardrail,
+)
+from pydantic import BaseModel
+
+
+@dataclass
+class Topology:
+    name: str
+    agent: Agent[Any]
+    input: str
+
+
+@function_tool
+def get_weather(city: str) -> str:
+    """Get the current weather for a given city."""
+    return f"The current weather in {city} is 31°C with Sunny."
+
+
+class WeatherStructured(BaseModel):
+    location: str
+    temperature_c: float
+    summary: str
+
+
+class MathHomeworkOutput(BaseModel):
+    is_math_homework: bool
+    reasoning: str
+
+
+class SupportResponse(BaseModel):
+    response: str
+
+
+class OutputCheck(BaseModel):
+    is_negative: bool
+    reasoning: str
+
+
+def simple_agent(model: Model, config: RunConfig) -> Topology:
+    """``02_simple_agent``: one agent, one model call."""
+    agent = Agent(name="Simple Agent", instructions="A simple agent that can answer questions.", model=model)
+    return Topology("simple", agent, "what is the capital of pakistan?")
+
+
+def tools(model: Model, config: RunConfig) -> Topology:
+    """``07_tools``: a tool call followed by a final answer."""
+    agent = Agent(name="Assistant", instructions="You are helpful Assistent.", model=model, tools=[get_weather])
+    return Topology("tools", agent, "what is the weather in lahore")
+
+
+def agent_as_tool(model: Model, config: RunConfig) -> Topology:
+    """``08_agent_as_tool``: an orchestrator calling three translator agents."""
+    languages = ["spanish", "french", "italian"]
+    translators = [
+        Agent(
+            name=f"{language}_agent",
+            instructions=f"You translate the user's message to {language.title()}",
+            handoff_description=f"An english to {language} translator",
+            model=model,
+        )
+        for language in languages
+    ]
+    orchestrator = Agent(
+        name="orchestrator_agent",
+        instructions=(
+            "You are a translation agent. You use the tools given to you to translate."
+            "If asked for multiple translations, you call the relevant tools in order."
+            "You never translate on your own, you always use the provided tools."
+        ),
+        tools=[
+            translator.as_tool(
+                tool_name=f"translate_to_{language}",
+                tool_description=f"Translate the user's message to {language.title()}",
+            )
+            for language, translator in zip(languages, translators)
+        ],
+        model=model,
+    )
+    return Topology("agent_as_tool", orchestrator, "Translate 'good morning' to spanish, french and italian")
+
+
+def handoffs(model: Model, config: RunConfig) -> Topology:
+    """``11_handoffs``: a triage agent handing off to a specialist."""
+    python_agent = Agent(name="expert python agent", instructions="you are a expert python agent", model=model)
+    next_agent = Agent(name="expert next.js agent", instructions="you are a expert next.js agent", model=model)
+    main_agent = Agent(
+        name="main agent",
+        instructions="you are a helpful agent",
+        handoffs=[python_agent, next_agent],
+        model=model,
+    )
+    return Topology("handoffs", main_agent, "how to create next.js app")
+
+
+def structured_output(model: Model, config: RunConfig) -> Topology:
+    """``12_structured_output``: a tool call and a validated pydantic output."""
+    agent = Agent(
+        name="Assistant",
+        instructions="You are helpful Assistent.",
+        model=model,
+        tools=[get_weather],
+        output_type=WeatherStructured,
+    )
+    return Topology("structured_output", agent, "what is the weather in lahore")
+
+
+def guardrails(model: Model, config: RunConfig) -> Topology:
+    """``13_guardrails``: input and output guardrails, each running an agent."""
+    guardrail_agent = Agent(
+        name="Guardrail check",
+        instructions="Check if the user is asking you to do their math homework.",
+        output_type=MathHomeworkOutput,
+        model=model,
+    )
+    output_guardrail_agent = Agent(
+        name="OutputPositiveCheck",
+        instructions="Check if the output contains negative words like 'bad' or 'hate'.",
+        output_type=OutputCheck,
+        model=model,
+    )
+
+    @input_guardrail
+    async def math_guardrail(
+        ctx: RunContextWrapper[None], agent: Agent, input: str | list[TResponseInputItem]
+    ) -> GuardrailFunctionOutput:
+        result = await Runner.run(guardrail_agent, input, context=ctx.context, run_config=config)
+        return GuardrailFunctionOutput(
+            output_info=result.final_output,
+            tripwire_triggered=result.final_output.is_math_homework,
+        )
+
+    @output_guardrail
+    async def negative_output_guardrail(
+        ctx: RunContextWrapper, agent: Agent, output: SupportResponse
+    ) -> GuardrailFunctionOutput:
+        result = await Runner.run(output_guardrail_agent, output.response, context=ctx.context, run_config=config)
+        return GuardrailFunctionOutput(
+            output_info=result.final_output,
+            tripwire_triggered=result.final_output.is_negative,
+        )
+
+    agent = Agent(
+        name="Customer support agent",
+        instructions="You are a customer support agent. You help customers with their questions.",
+        input_guardrails=[math_guardrail],
+        output_guardrails=[negative_output_guardrail],
+        output_type=SupportResponse,
+        model=model,
+    )
+    return Topology("guardrails", agent, "How do I reset my password?")
+
+
+TOPOLOGIES: dict[str, Callable[[Model, RunConfig], Topology]] = {
+    "simple": simple_agent,
+    "tools": tools,
+    "agent_as_tool": agent_as_tool,
+    "handoffs": handoffs,
+    "structured_output": structured_output,
+    "guardrails": guardrails,
+}
@@ -0,0 +1,124 @@
+"""Wall time and prompt size of the ``08_agent_as_tool`` translation orchestrator.
+
+Run from the ``shared`` directory:
+
+    uv run python -m benchmarks.translation --languages 3 --latency 0.2
+
+Each request asks for ``--languages`` translations. In ``serial`` mode the
+orchestrator calls one translator tool per turn, as the lesson's original
+"call the relevant tools in order" instructions made it do. In ``parallel``
+mode it calls them all in one turn, and the Runner runs them at once (at most
+``--max-concurrent`` at a time, through ``limit_concurrency``). In
+``multiplexed`` mode the translators sit behind one ``multiplex_tool`` that
+takes a ``target_language``, so the orchestrator's prompt carries one tool
+schema instead of one per language. The fake server's ``--latency`` stands
+in for a model round trip. To see how the prompt grows with the number of
+languages:
+
+    for n in 3 10 20 32; do uv run python -m benchmarks.translation --languages $n; done
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any
+
+from agents import Agent, AsyncOpenAI, ModelSettings, OpenAIChatCompletionsModel, RunConfig, Runner
+
+from gemini_shared.agent_tools import limit_concurrency, multiplex_tool
+from gemini_shared.client import build_http_client
+from gemini_shared.fake_server import FakeChatServer, FakeServerConfig
+
+LANGUAGES = [
+    "spanish", "french", "italian", "german", "portuguese", "dutch", "swedish", "norwegian",
+    "danish", "finnish", "polish", "czech", "hungarian", "romanian", "greek", "turkish",
+    "russian", "ukrainian", "arabic", "hebrew", "persian", "urdu", "hindi", "bengali",
+    "punjabi", "tamil", "thai", "vietnamese", "indonesian", "malay", "japanese", "korean",
+]  # fmt: skip
+
+MODES = ("serial", "parallel", "multiplexed")
+
+
+def orchestrator(model: OpenAIChatCompletionsModel, languages: list[str], mode: str, max_concurrent: int) -> Agent:
+    translators = {
+        language: Agent(
+            name=f"{language}_agent",
+            instructions=f"You translate the user's message to {language.title()}",
+            model=model,
+        )
+        for language in languages
+    }
+    if mode == "multiplexed":
+        tools = [
+            multiplex_tool(translators, "translate", "Translate the user's message to the target language")
+        ]
+    else:
+        tools = [
+            agent.as_tool(
+                tool_name=f"translate_to_{language}",
+                tool_description=f"Translate the user's message to {language.title()}",
+            )
+            for language, agent in translators.items()
+        ]
+    return Agent(
+        name="orchestrator_agent",
+        instructions=(
+            "You are a translation agent. You use the tools given to you to translate."
+            "If asked for multiple translations, you call all the relevant tools at once."
+            "You never translate on your own, you always use the provided tools."
+        ),
+        tools=tools if mode == "serial" else limit_concurrency(tools, max_concurrent),
+        model_settings=ModelSettings(parallel_tool_calls=mode != "serial"),
+        model=model,
+    )
+
+
+async def measure(server: FakeChatServer, mode: str, languages: list[str], requests: int, max_concurrent: int) -> dict[str, Any]:
+    client = AsyncOpenAI(api_key="fake", base_url=server.base_url, http_client=build_http_client())
+    model = OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=client)
+    agent = orchestrator(model, languages, mode, max_concurrent)
+    config = RunConfig(tracing_disabled=True)
+    prompt = f"Translate 'good morning' to {', '.join(languages)}"
+    # Serial mode takes a turn per language.
+    max_turns = len(languages) + 2
+
+    await Runner.run(agent, prompt, run_config=config, max_turns=max_turns)
+    server.reset_stats()
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        await Runner.run(agent, prompt, run_config=config, max_turns=max_turns)
+        latencies.append(time.perf_counter() - started)
+    await client.close()
+    return {
+        "mode": mode,
+        "mean_s": statistics.mean(latencies),
+        "round_trips": server.stats.requests / requests,
+        "prompt_tokens": server.stats.prompt_tokens / requests,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Serial, parallel and multiplexed sub-agent tool calls.")
+    parser.add_argument("--languages", type=int, default=3, help=f"languages per request, up to {len(LANGUAGES)}")
+    parser.add_argument("--requests", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.2, help="fake model latency per round trip, in seconds")
+    parser.add_argument("--max-concurrent", type=int, default=8)
+    parser.add_argument("--mode", action="append", choices=MODES, help="repeatable; default all")
+    args = parser.parse_args()
+
+    languages = LANGUAGES[: args.languages]
+    async with FakeChatServer(FakeServerConfig(latency=args.latency)) as server:
+        print(f"{len(languages)} languages, {args.latency:g}s per model round trip")
+        print(f"{'mode':<13}{'mean s':>10}{'round trips':>14}{'prompt tokens':>16}")
+        for mode in args.mode or MODES:
+            result = await measure(server, mode, languages, args.requests, args.max_concurrent)
+            print(
+                f"{result['mode']:<13}{result['mean_s']:>10.2f}{result['round_trips']:>14.1f}"
+                f"{result['prompt_tokens']:>16.0f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,118 @@
+from .adaptive import AdaptiveModel, AdaptiveStats, CircuitOpenError
+from .admission import AdmissionController, AdmissionMetrics, AdmissionRejected
+from .agent_tools import limit_concurrency, multiplex_tool
+from .batch import (
+    BatchItem,
+    BatchResult,
+    BatchSummary,
+    batch_run_config,
+    completed_ids,
+    iter_prompts,
+    read_prompts,
+    run_batch,
+    run_batch_to_file,
+)
+from .cancellation import CancellationStats, Generation, GenerationTracker, cancellation_stats
+from .client import (
+    DEFAULT_MODEL,
+    GEMINI_BASE_URL,
+    aclose_client,
+    get_adaptive_model,
+    get_api_key,
+    get_client,
+    get_config,
+    get_model,
+)
+from .fake_server import FakeChatServer, FakeServerConfig, FakeServerStats
+from .fake_weather import FakeWeatherServer, FakeWeatherStats
+from .loop import BackgroundLoop
+from .offline import OfflineBatchRunner, OfflineJob, OfflineRunResult, batch_request
+from .offload import OffloadStats, function_tool, offload, offload_stats
+from .ratelimit import RateLimitedModel, SharedTokenBucket, TokenBucket, estimate_tokens
+from .resp_server import RespServer
+from .sessions import (
+    RedisSessionBackend,
+    SessionBackend,
+    SessionSnapshot,
+    SQLiteSessionBackend,
+    get_session_backend,
+)
+from .sharded import run_sharded
+from .single_flight import SingleFlightStats, single_flight, single_flight_stats
+from .streaming import CoalescingStreamWriter, StreamMetrics, stream_metrics
+from .sync_runner import get_background_loop, run_sync
+from .translation_memo import MemoStats, TranslationMemo, memo_key
+from .weather import WeatherClient, WeatherError, WeatherStats, get_weather_client, normalize_city
+
+__all__ = [
+    "AdaptiveModel",
+    "AdaptiveStats",
+    "AdmissionController",
+    "AdmissionMetrics",
+    "AdmissionRejected",
+    "BackgroundLoop",
+    "BatchItem",
+    "BatchResult",
+    "BatchSummary",
+    "CircuitOpenError",
+    "CancellationStats",
+    "CoalescingStreamWriter",
+    "DEFAULT_MODEL",
+    "FakeChatServer",
+    "FakeServerConfig",
+    "FakeServerStats",
+    "FakeWeatherServer",
+    "FakeWeatherStats",
+    "GEMINI_BASE_URL",
+    "Generation",
+    "GenerationTracker",
+    "MemoStats",
+    "OfflineBatchRunner",
+    "OfflineJob",
+    "OfflineRunResult",
+    "OffloadStats",
+    "RateLimitedModel",
+    "RedisSessionBackend",
+    "RespServer",
+    "SQLiteSessionBackend",
+    "SessionBackend",
+    "SessionSnapshot",
+    "SharedTokenBucket",
+    "SingleFlightStats",
+    "StreamMetrics",
+    "TokenBucket",
+    "TranslationMemo",
+    "WeatherClient",
+    "WeatherError",
+    "WeatherStats",
+    "aclose_client",
+    "batch_request",
+    "batch_run_config",
+    "cancellation_stats",
+    "completed_ids",
+    "estimate_tokens",
+    "function_tool",
+    "get_adaptive_model",
+    "get_api_key",
+    "get_background_loop",
+    "get_client",
+    "get_config",
+    "get_model",
+    "get_session_backend",
+    "get_weather_client",
+    "iter_prompts",
+    "limit_concurrency",
+    "memo_key",
+    "multiplex_tool",
+    "normalize_city",
+    "offload",
+    "offload_stats",
+    "read_prompts",
+    "run_batch",
+    "run_batch_to_file",
+    "run_sharded",
+    "run_sync",
+    "single_flight",
+    "single_flight_stats",
+    "stream_metrics",
+]
@@ -0,0 +1,259 @@
+"""Adaptive concurrency, retries and a circuit breaker around any ``Model``.
+
+Without it a 429 from the provider surfaces as an exception, and a batch job
+has to guess how many requests to keep in flight. ``AdaptiveModel`` wraps a
+model (usually the shared ``OpenAIChatCompletionsModel``) and plugs into
+``RunConfig(model=...)`` or ``Agent(model=...)``:
+
+* concurrency limit, AIMD style: each success adds ``1 / limit`` to the limit,
+  so it grows by about one per round of requests; a 429, a timeout or (with
+  ``latency_target``) a slow response halves it, at most once per latency
+  window;
+* retries of 429s, 5xx, timeouts and connection errors, with full-jitter
+  exponential backoff (at least the server's ``Retry-After``) as long as the
+  call's ``deadline`` allows;
+* a circuit breaker: after ``failure_threshold`` attempts in a row fail with a
+  5xx, a timeout or a connection error, calls fail at once with
+  ``CircuitOpenError`` for ``reset_timeout`` seconds, then a single trial
+  request decides whether to close it again. A 429 never counts: it is flow
+  control, already handled by the limit and the backoff, and like any other
+  answer from the provider it shows the provider is up.
+
+A streamed response is only retried if it failed before its first event.
+"""
+
+import asyncio
+import random
+import time
+from collections.abc import AsyncIterator
+from dataclasses import asdict, dataclass
+from typing import Any
+
+import openai
+from agents.items import ModelResponse, TResponseStreamEvent
+from agents.models.interface import Model
+
+
+class CircuitOpenError(Exception):
+    """The provider keeps failing; calls are short-circuited for now."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Model circuit is open after repeated failures. Retry in {retry_after:.0f}s.")
+        self.retry_after = retry_after
+
+
+@dataclass
+class AdaptiveStats:
+    requests: int = 0
+    successes: int = 0
+    throttled: int = 0
+    failures: int = 0
+    retries: int = 0
+    short_circuited: int = 0
+    circuit_trips: int = 0
+    limit_decreases: int = 0
+    max_in_flight: int = 0
+
+
+def _retry_after(exc: Exception) -> float:
+    response = getattr(exc, "response", None)
+    try:
+        return float(response.headers.get("retry-after", 0)) if response is not None else 0.0
+    except ValueError:
+        return 0.0
+
+
+class AdaptiveModel(Model):
+    def __init__(
+        self,
+        model: Model,
+        initial_limit: float = 8,
+        min_limit: float = 1,
+        max_limit: float = 256,
+        latency_target: float | None = None,
+        deadline: float = 120.0,
+        base_delay: float = 0.5,
+        max_delay: float = 16.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ):
+        self.model = model
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.deadline = deadline
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.stats = AdaptiveStats()
+        self.in_flight = 0
+        self._slots = asyncio.Condition()
+        self._latency = 0.0
+        self._last_decrease = 0.0
+        self._consecutive_failures = 0
+        self._opened_at: float | None = None
+        self._trial_running = False
+
+    # Concurrency limit
+
+    async def _acquire(self) -> None:
+        async with self._slots:
+            await self._slots.wait_for(lambda: self.in_flight < max(int(self.limit), 1))
+            self.in_flight += 1
+            self.stats.max_in_flight = max(self.stats.max_in_flight, self.in_flight)
+
+    async def _release(self) -> None:
+        async with self._slots:
+            self.in_flight -= 1
+            self._slots.notify_all()
+
+    def _increase(self, latency: float) -> None:
+        self._latency = latency if not self._latency else 0.9 * self._latency + 0.1 * latency
+        if self.latency_target is not None and latency > self.latency_target:
+            self._decrease()
+        else:
+            self.limit = min(self.limit + 1 / self.limit, self.max_limit)
+
+    def _decrease(self) -> None:
+        # React once per latency window, not once per request that was already in flight.
+        now = time.monotonic()
+        if now - self._last_decrease < max(self._latency, 0.1):
+            return
+        self._last_decrease = now
+        self.limit = max(self.limit / 2, self.min_limit)
+        self.stats.limit_decreases += 1
+
+    # Circuit breaker
+
+    def _check_circuit(self) -> bool:
+        """Raise if the circuit is open; return whether this request is the half-open trial."""
+        if self._opened_at is None:
+            return False
+        remaining = self._opened_at + self.reset_timeout - time.monotonic()
+        if remaining > 0 or self._trial_running:
+            self.stats.short_circuited += 1
+            raise CircuitOpenError(max(remaining, 1.0))
+        # Half open: let this one request through as a trial.
+        self._trial_running = True
+        return True
+
+    def _on_answer(self) -> None:
+        """The provider answered, even if with an error: it is up, so close the circuit."""
+        self._consecutive_failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    def _on_success(self, latency: float) -> None:
+        self.stats.successes += 1
+        self._on_answer()
+        self._increase(latency)
+
+    def _on_failure(self, exc: Exception) -> float | None:
+        """Record a failed attempt; return the backoff before a retry, or None if it should not be retried."""
+        if isinstance(exc, openai.RateLimitError):
+            self.stats.throttled += 1
+            self._decrease()
+            self._on_answer()
+            return _retry_after(exc)
+        if isinstance(exc, openai.APITimeoutError):
+            self.stats.failures += 1
+            self._decrease()
+        elif isinstance(exc, (openai.APIConnectionError, openai.InternalServerError)):
+            self.stats.failures += 1
+        else:
+            # A 4xx or an error in our own code: not the provider being down.
+            self._on_answer()
+            return None
+
+        self._consecutive_failures += 1
+        if self._trial_running or self._consecutive_failures >= self.failure_threshold:
+            if self._opened_at is None or self._trial_running:
+                self.stats.circuit_trips += 1
+            self._opened_at = time.monotonic()
+            self._trial_running = False
+        return _retry_after(exc)
+
+    def _end_trial(self, trial: bool) -> None:
+        # A trial that ended without an outcome (cancelled, or the stream closed
+        # early) leaves the circuit half open, so the next caller runs a new trial.
+        if trial:
+            self._trial_running = False
+
+    def _backoff(self, attempt: int, retry_after: float) -> float:
+        return max(random.uniform(0, min(self.max_delay, self.base_delay * 2**attempt)), retry_after)
+
+    # Model interface
+
+    async def get_response(self, *args: Any, **kwargs: Any) -> ModelResponse:
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            trial = self._check_circuit()
+            await self._acquire()
+            self.stats.requests += 1
+            sent = time.monotonic()
+            try:
+                response = await self.model.get_response(*args, **kwargs)
+            except Exception as exc:
+                retry_after = self._on_failure(exc)
+                error = exc
+            else:
+                self._on_success(time.monotonic() - sent)
+                return response
+            finally:
+                self._end_trial(trial)
+                await self._release()
+
+            if retry_after is None:
+                raise error
+            delay = self._backoff(attempt, retry_after)
+            if time.monotonic() + delay - started > self.deadline:
+                raise error
+            self.stats.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def stream_response(self, *args: Any, **kwargs: Any) -> AsyncIterator[TResponseStreamEvent]:
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            trial = self._check_circuit()
+            await self._acquire()
+            self.stats.requests += 1
+            sent = time.monotonic()
+            first_event: float | None = None
+            try:
+                async for event in self.model.stream_response(*args, **kwargs):
+                    if first_event is None:
+                        first_event = time.monotonic() - sent
+                        self._on_answer()
+                    yield event
+            except Exception as exc:
+                # Part of the answer has been delivered, so it cannot be replayed.
+                retry_after = self._on_failure(exc) if first_event is None else None
+                error = exc
+            else:
+                self._on_success(first_event if first_event is not None else time.monotonic() - sent)
+                return
+            finally:
+                self._end_trial(trial)
+                await self._release()
+
+            if retry_after is None:
+                raise error
+            delay = self._backoff(attempt, retry_after)
+            if time.monotonic() + delay - started > self.deadline:
+                raise error
+            self.stats.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "limit": round(self.limit, 1),
+            "in_flight": self.in_flight,
+            "circuit": "closed" if self._opened_at is None else "open",
+            **asdict(self.stats),
+        }
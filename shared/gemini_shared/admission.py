@@ -0,0 +1,151 @@
+"""Admission control with per-user fair queuing in front of the Runner.
+
+Letting every chat request go straight to the model turns a traffic spike into
+a burst of 429s and an unbounded pile of waiting requests. ``AdmissionController``
+admits at most ``max_concurrent`` runs at once. Further requests wait in one
+queue per user and are admitted round-robin across users, so a single busy
+user cannot starve the others. When the waiting room is full (``max_queue``
+in total or ``max_queue_per_user`` for one user) a request is rejected at once
+with ``AdmissionRejected``, which carries a retry-after hint, instead of
+joining a queue it would time out in.
+
+    async with admission.slot(user_id):
+        result = await Runner.run(agent, query, run_config=config)
+"""
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+
+class AdmissionRejected(Exception):
+    """The queue is full; try again after ``retry_after`` seconds."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Too many requests are waiting. Please retry in {retry_after:.0f}s.")
+        self.retry_after = retry_after
+
+
+@dataclass
+class AdmissionMetrics:
+    admitted: int = 0
+    rejected: int = 0
+    max_queue_depth: int = 0
+    total_wait: float = 0.0
+    # Recent waits, for percentiles
+    waits: deque[float] = field(default_factory=lambda: deque(maxlen=1000))
+
+    def wait_percentile(self, fraction: float) -> float:
+        if not self.waits:
+            return 0.0
+        ordered = sorted(self.waits)
+        return ordered[min(int(fraction * len(ordered)), len(ordered) - 1)]
+
+
+class AdmissionController:
+    def __init__(self, max_concurrent: int = 16, max_queue: int = 64, max_queue_per_user: int = 4):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_queue_per_user = max_queue_per_user
+        self.active = 0
+        self.metrics = AdmissionMetrics()
+        self._queues: dict[str, deque[asyncio.Future[None]]] = {}
+        # Users with someone waiting, in the order they get their next turn
+        self._turns: deque[str] = deque()
+        # Moving average of how long an admitted run holds its slot
+        self._service_time = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def retry_after(self) -> float:
+        """Rough time until the current queue drains."""
+        service_time = self._service_time or 1.0
+        return max(1.0, service_time * (self.queue_depth + 1) / self.max_concurrent)
+
+    async def acquire(self, user_id: str) -> None:
+        if self.active < self.max_concurrent and not self._queues:
+            self.active += 1
+            self._record_wait(0.0)
+            return
+
+        queue = self._queues.get(user_id)
+        if self.queue_depth >= self.max_queue or (queue is not None and len(queue) >= self.max_queue_per_user):
+            self.metrics.rejected += 1
+            raise AdmissionRejected(self.retry_after())
+
+        ticket: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        if queue is None:
+            queue = self._queues[user_id] = deque()
+            self._turns.append(user_id)
+        queue.append(ticket)
+        self.metrics.max_queue_depth = max(self.metrics.max_queue_depth, self.queue_depth)
+
+        started = time.perf_counter()
+        try:
+            await ticket
+        except asyncio.CancelledError:
+            if ticket.cancelled():
+                self._withdraw(user_id, ticket)
+            else:
+                # Admitted just as we were cancelled; hand the slot on.
+                self.release()
+            raise
+        self._record_wait(time.perf_counter() - started)
+
+    def release(self, service_time: float | None = None) -> None:
+        self.active -= 1
+        if service_time is not None:
+            self._service_time = service_time if not self._service_time else 0.8 * self._service_time + 0.2 * service_time
+        while self.active < self.max_concurrent and self._turns:
+            user_id = self._turns.popleft()
+            queue = self._queues[user_id]
+            ticket = queue.popleft()
+            if queue:
+                self._turns.append(user_id)
+            else:
+                del self._queues[user_id]
+            if not ticket.done():
+                self.active += 1
+                ticket.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, user_id: str) -> AsyncIterator[None]:
+        """Wait for a turn for ``user_id`` and hold it for the block."""
+        await self.acquire(user_id)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(time.perf_counter() - started)
+
+    def _withdraw(self, user_id: str, ticket: asyncio.Future[None]) -> None:
+        queue = self._queues.get(user_id)
+        if queue is None or ticket not in queue:
+            return
+        queue.remove(ticket)
+        if not queue:
+            del self._queues[user_id]
+            self._turns.remove(user_id)
+
+    def _record_wait(self, wait: float) -> None:
+        self.metrics.admitted += 1
+        self.metrics.total_wait += wait
+        self.metrics.waits.append(wait)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "active": self.active,
+            "queue_depth": self.queue_depth,
+            "waiting_users": len(self._queues),
+            "admitted": self.metrics.admitted,
+            "rejected": self.metrics.rejected,
+            "max_queue_depth": self.metrics.max_queue_depth,
+            "wait_p50_s": round(self.metrics.wait_percentile(0.5), 3),
+            "wait_p95_s": round(self.metrics.wait_percentile(0.95), 3),
+        }
@@ -0,0 +1,85 @@
+"""Helpers for agents used as tools.
+
+When the model asks for several tools in one turn, the Runner already runs
+them concurrently and returns their results in the order they were called. So
+an orchestrator only has to ask for all its sub-agents at once.
+``limit_concurrency`` caps how many of a set of tools run at the same time,
+so one request for ten languages does not start ten nested runs at once:
+
+    tools = limit_concurrency([spanish_agent.as_tool(...), french_agent.as_tool(...)], 3)
+
+Every tool's name, description and schema is resent on every turn of the
+orchestrator, so a tool per sub-agent grows its prompt with each one added.
+``multiplex_tool`` puts a set of similar sub-agents behind one tool with an
+``enum`` argument that picks the agent:
+
+    translate = multiplex_tool(
+        {"spanish": spanish_agent, "french": french_agent},
+        "translate",
+        "Translate the user's message to the target language",
+    )
+"""
+
+import asyncio
+import dataclasses
+import json
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+from typing import Any
+
+from agents import Agent, FunctionTool, RunContextWrapper, Runner
+
+
+def limit_concurrency(tools: Sequence[FunctionTool], max_concurrent: int) -> list[FunctionTool]:
+    """Copies of ``tools`` that share one cap of ``max_concurrent`` calls in flight."""
+    limiter = asyncio.Semaphore(max_concurrent)
+
+    def limited(tool: FunctionTool) -> FunctionTool:
+        invoke = tool.on_invoke_tool
+
+        async def on_invoke_tool(context: RunContextWrapper[Any], arguments: str) -> Any:
+            async with limiter:
+                return await invoke(context, arguments)
+
+        return dataclasses.replace(tool, on_invoke_tool=on_invoke_tool)
+
+    return [limited(tool) for tool in tools]
+
+
+def multiplex_tool(
+    agents: Mapping[str, Agent[Any]],
+    tool_name: str,
+    tool_description: str,
+    choice_name: str = "target_language",
+    run: Callable[[str, str], Awaitable[str]] | None = None,
+) -> FunctionTool:
+    """One tool that runs ``agents[choice]`` on its ``input`` argument.
+
+    ``run``, if given, is called with the choice and the input instead of
+    running the agent directly, for example to answer from a cache.
+    """
+
+    async def on_invoke_tool(context: RunContextWrapper[Any], arguments: str) -> str:
+        parsed = json.loads(arguments)
+        choice, text = parsed[choice_name], parsed["input"]
+        if choice not in agents:
+            # Told to the model, like the errors of any other function tool.
+            return f"Unknown {choice_name} {choice!r}; use one of: {', '.join(agents)}"
+        if run is not None:
+            return await run(choice, text)
+        result = await Runner.run(agents[choice], text, context=context.context)
+        return str(result.final_output)
+
+    return FunctionTool(
+        name=tool_name,
+        description=tool_description,
+        params_json_schema={
+            "type": "object",
+            "properties": {
+                "input": {"type": "string", "description": "The message to pass on."},
+                choice_name: {"type": "string", "enum": list(agents)},
+            },
+            "required": ["input", choice_name],
+            "additionalProperties": False,
+        },
+        on_invoke_tool=on_invoke_tool,
+    )
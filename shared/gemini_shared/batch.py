@@ -0,0 +1,243 @@
+"""Run many prompts through one agent with bounded concurrency.
+
+``run_batch`` feeds prompts to ``concurrency`` workers that each call
+``Runner.run`` and yields a ``BatchResult`` per prompt, either as soon as it
+finishes or in input order. ``run_batch_to_file`` appends the results to a
+JSONL file as they arrive and, on a rerun, skips every prompt that already has
+a successful line there, so an interrupted job resumes where it stopped.
+
+Requests per minute and tokens per minute are enforced by
+``batch_run_config``, which puts the model behind ``RateLimitedModel`` and
+``AdaptiveModel`` so 429s are retried and the concurrency settles at what the
+quota allows.
+"""
+
+import asyncio
+import json
+import time
+from collections.abc import AsyncIterator, Iterable, Iterator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from agents import Agent, RunConfig, Runner
+
+from .adaptive import AdaptiveModel
+from .client import DEFAULT_MODEL, get_model
+from .ratelimit import RateLimitedModel, TokenBucket
+
+
+@dataclass
+class BatchItem:
+    id: str
+    prompt: str
+
+
+@dataclass
+class BatchResult:
+    id: str
+    prompt: str
+    output: Any = None
+    error: str | None = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+    seconds: float = 0.0
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), ensure_ascii=False, default=str)
+
+
+def read_prompts(source: str | Path | Iterable[str]) -> list[BatchItem]:
+    """Prompts from a JSONL file or a list of strings.
+
+    Each JSONL line is either a JSON string or an object with a ``prompt`` and
+    an optional ``id``; the line number is the id otherwise.
+    """
+    if isinstance(source, (str, Path)):
+        return list(iter_prompts(source))
+    return [to_item(index, record) for index, record in enumerate(source)]
+
+
+def iter_prompts(path: str | Path, shard: int = 0, shards: int = 1) -> Iterator[BatchItem]:
+    """Read a JSONL prompt file lazily, keeping every ``shards``-th prompt starting at ``shard``."""
+    with open(path, encoding="utf-8") as lines:
+        index = 0
+        for line in lines:
+            if not line.strip():
+                continue
+            # Only this shard's lines are parsed.
+            if index % shards == shard:
+                yield to_item(index, json.loads(line))
+            index += 1
+
+
+def to_item(index: int, record: str | dict[str, Any]) -> BatchItem:
+    if isinstance(record, str):
+        return BatchItem(id=str(index), prompt=record)
+    return BatchItem(id=str(record.get("id", index)), prompt=record["prompt"])
+
+
+def completed_ids(path: str | Path) -> set[str]:
+    """Ids that already have a successful result in an output file."""
+    done: set[str] = set()
+    path = Path(path)
+    if not path.exists():
+        return done
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            # A line cut short when the previous run was interrupted.
+            continue
+        if record.get("error") is None:
+            done.add(record["id"])
+    return done
+
+
+def batch_run_config(
+    model_name: str = DEFAULT_MODEL,
+    rpm: float | TokenBucket | None = None,
+    tpm: float | TokenBucket | None = None,
+    output_tokens_estimate: int = 512,
+) -> RunConfig:
+    """A run config whose model respects RPM/TPM quotas and retries 429s.
+
+    ``rpm`` and ``tpm`` are per-minute limits or ready-made buckets (to share
+    one budget between several configs or processes).
+    """
+    limited = RateLimitedModel(
+        get_model(model_name, sdk_retries=False),
+        rpm=_bucket(rpm),
+        tpm=_bucket(tpm),
+        output_tokens_estimate=output_tokens_estimate,
+    )
+    return RunConfig(model=AdaptiveModel(limited), tracing_disabled=True)
+
+
+def _bucket(limit: float | TokenBucket | None) -> TokenBucket | None:
+    if isinstance(limit, TokenBucket):
+        return limit
+    return TokenBucket(limit) if limit else None
+
+
+def _output(final_output: Any) -> Any:
+    # Structured outputs (pydantic models) are stored as plain JSON objects.
+    return final_output.model_dump() if hasattr(final_output, "model_dump") else final_output
+
+
+async def _run_one(agent: Agent[Any], item: BatchItem, run_config: RunConfig | None) -> BatchResult:
+    started = time.perf_counter()
+    try:
+        result = await Runner.run(agent, item.prompt, run_config=run_config)
+    except Exception as e:
+        return BatchResult(item.id, item.prompt, error=f"{type(e).__name__}: {e}", seconds=time.perf_counter() - started)
+    usage = result.context_wrapper.usage
+    return BatchResult(
+        item.id,
+        item.prompt,
+        output=_output(result.final_output),
+        input_tokens=usage.input_tokens,
+        output_tokens=usage.output_tokens,
+        seconds=time.perf_counter() - started,
+    )
+
+
+async def run_batch(
+    agent: Agent[Any],
+    items: Iterable[BatchItem],
+    run_config: RunConfig | None = None,
+    concurrency: int = 8,
+    ordered: bool = False,
+) -> AsyncIterator[BatchResult]:
+    """Run every item through ``agent`` and yield the results.
+
+    At most ``concurrency`` runs are in flight. With ``ordered=True`` results
+    come back in input order, holding finished ones until those before them
+    are done; otherwise they come back as they finish.
+    """
+    pending = enumerate(items)
+    results: asyncio.Queue[tuple[int, BatchResult] | None] = asyncio.Queue()
+
+    async def worker() -> None:
+        try:
+            # Workers share one iterator, so prompts are read lazily.
+            for position, item in pending:
+                await results.put((position, await _run_one(agent, item, run_config)))
+        finally:
+            await results.put(None)
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    held: dict[int, BatchResult] = {}
+    next_position = 0
+    running = len(workers)
+    try:
+        while running:
+            entry = await results.get()
+            if entry is None:
+                running -= 1
+                continue
+            position, result = entry
+            if not ordered:
+                yield result
+                continue
+            held[position] = result
+            while next_position in held:
+                yield held.pop(next_position)
+                next_position += 1
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+@dataclass
+class BatchSummary:
+    total: int
+    skipped: int
+    succeeded: int = 0
+    failed: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    seconds: float = 0.0
+
+
+async def run_batch_to_file(
+    agent: Agent[Any],
+    items: Iterable[BatchItem],
+    output_path: str | Path,
+    run_config: RunConfig | None = None,
+    concurrency: int = 8,
+    ordered: bool = False,
+    resume: bool = True,
+) -> BatchSummary:
+    """Append one JSON line per result to ``output_path``, skipping finished ids when resuming.
+
+    ``items`` is consumed lazily, as workers become free, so a generator such
+    as ``iter_prompts`` keeps only the prompts in flight in memory. ``total``
+    and ``skipped`` are counted as it goes and are final once this returns.
+    """
+    done = completed_ids(output_path) if resume else set()
+    summary = BatchSummary(total=0, skipped=0)
+
+    def todo() -> Iterator[BatchItem]:
+        for item in items:
+            summary.total += 1
+            if item.id in done:
+                summary.skipped += 1
+                continue
+            yield item
+
+    started = time.perf_counter()
+    with open(output_path, "a" if resume else "w", encoding="utf-8") as output:
+        async for result in run_batch(agent, todo(), run_config, concurrency, ordered):
+            # One flushed line per result is the checkpoint a rerun resumes from.
+            output.write(result.to_json() + "\n")
+            output.flush()
+            if result.error is None:
+                summary.succeeded += 1
+            else:
+                summary.failed += 1
+            summary.input_tokens += result.input_tokens
+            summary.output_tokens += result.output_tokens
+    summary.seconds = time.perf_counter() - started
+    return summary
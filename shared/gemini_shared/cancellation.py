@@ -0,0 +1,100 @@
+"""Per-session tracking and cancellation of streamed generations.
+
+Without it, a chat user who sends a new message or closes the tab leaves the
+earlier ``Runner.run_streamed`` running until the model finishes, still
+spending tokens and holding a connection. ``GenerationTracker`` remembers the
+one generation in flight for a session. ``cancel()`` stops the run (which
+closes the upstream HTTP stream) and cancels the task consuming it, then
+estimates what the cancellation saved: the tokens an average completed answer
+still had to go, and the time they would have taken at this answer's rate.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+
+from agents import RunResultStreaming
+
+
+@dataclass
+class CancellationStats:
+    completed: int = 0
+    completed_tokens: int = 0
+    cancelled: int = 0
+    tokens_saved: float = 0.0
+    seconds_saved: float = 0.0
+
+    @property
+    def average_tokens(self) -> float:
+        return self.completed_tokens / self.completed if self.completed else 0.0
+
+
+# Totals across every tracker in the process.
+cancellation_stats = CancellationStats()
+
+
+@dataclass
+class Generation:
+    result: RunResultStreaming
+    task: asyncio.Task | None
+    started: float = field(default_factory=time.perf_counter)
+    chars: int = 0
+    cancel_reason: str | None = None
+    tokens_saved: float = 0.0
+    seconds_saved: float = 0.0
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_reason is not None
+
+    @property
+    def tokens(self) -> int:
+        """Tokens received so far (about four characters per token)."""
+        return self.chars // 4
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def add(self, delta: str) -> None:
+        self.chars += len(delta)
+
+
+class GenerationTracker:
+    def __init__(self, stats: CancellationStats = cancellation_stats):
+        self.stats = stats
+        self.current: Generation | None = None
+
+    def start(self, result: RunResultStreaming) -> Generation:
+        """Track ``result`` as the session's generation, cancelling the previous one."""
+        self.cancel("superseded")
+        self.current = Generation(result=result, task=asyncio.current_task())
+        return self.current
+
+    def finish(self, generation: Generation) -> None:
+        if self.current is generation:
+            self.current = None
+        if not generation.cancelled:
+            self.stats.completed += 1
+            self.stats.completed_tokens += generation.tokens
+
+    def cancel(self, reason: str) -> Generation | None:
+        """Stop the generation in flight, if any, and record what that saved."""
+        generation = self.current
+        if generation is None:
+            return None
+        self.current = None
+        generation.cancel_reason = reason
+        generation.result.cancel()
+        if generation.task is not None and generation.task is not asyncio.current_task():
+            generation.task.cancel()
+
+        remaining = max(self.stats.average_tokens - generation.tokens, 0.0)
+        elapsed = generation.elapsed
+        rate = generation.tokens / elapsed if generation.tokens and elapsed > 0 else 0.0
+        generation.tokens_saved = remaining
+        generation.seconds_saved = remaining / rate if rate else 0.0
+        self.stats.cancelled += 1
+        self.stats.tokens_saved += generation.tokens_saved
+        self.stats.seconds_saved += generation.seconds_saved
+        return generation
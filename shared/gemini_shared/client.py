@@ -0,0 +1,120 @@
+"""One pooled Gemini client for the whole process.
+
+Building a fresh ``AsyncOpenAI`` client per script or per chat session means a
+new connection pool, and therefore a new TCP + TLS handshake, for every
+session. Here the client, the models and the run config are created once and
+reused by every agent, session and nested ``Runner.run``.
+"""
+
+import os
+
+import httpx
+from agents import AsyncOpenAI, OpenAIChatCompletionsModel, RunConfig
+from dotenv import find_dotenv, load_dotenv
+
+from .adaptive import AdaptiveModel
+
+# Load the .env file of the lesson being run, not the one next to this module
+load_dotenv(find_dotenv(usecwd=True))
+
+#Reference: https://ai.google.dev/gemini-api/docs/openai
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com/v1beta/openai/"
+DEFAULT_MODEL = "gemini-2.0-flash"
+
+# Connection pool and timeout tuning.
+MAX_CONNECTIONS = int(os.getenv("GEMINI_MAX_CONNECTIONS", "100"))
+MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("GEMINI_MAX_KEEPALIVE", "20"))
+KEEPALIVE_EXPIRY = float(os.getenv("GEMINI_KEEPALIVE_EXPIRY", "60"))
+CONNECT_TIMEOUT = float(os.getenv("GEMINI_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("GEMINI_READ_TIMEOUT", "60"))
+
+
+def get_api_key() -> str:
+    gemini_api_key = os.getenv("GEMINI_API_KEY")
+
+    # Check if the API key is present; if not, raise an error
+    if not gemini_api_key:
+        raise ValueError("GEMINI_API_KEY is not set. Please ensure it is defined in your .env file.")
+    return gemini_api_key
+
+
+def build_http_client() -> httpx.AsyncClient:
+    """Create a keep-alive connection pool with explicit timeouts."""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+    )
+
+
+_client: AsyncOpenAI | None = None
+_models: dict[tuple[str, bool], OpenAIChatCompletionsModel] = {}
+_adaptive_models: dict[str, AdaptiveModel] = {}
+_configs: dict[tuple[str, bool], RunConfig] = {}
+
+
+def get_client() -> AsyncOpenAI:
+    """Return the process-wide Gemini client.
+
+    The underlying pool is bound to the event loop that first uses it, so
+    callers should stick to one loop per process.
+    """
+    global _client
+    if _client is None:
+        _client = AsyncOpenAI(
+            api_key=get_api_key(),
+            base_url=os.getenv("GEMINI_BASE_URL", GEMINI_BASE_URL),
+            http_client=build_http_client(),
+        )
+    return _client
+
+
+def get_model(model_name: str = DEFAULT_MODEL, sdk_retries: bool = True) -> OpenAIChatCompletionsModel:
+    """Return the shared chat-completions model for ``model_name``.
+
+    ``sdk_retries=False`` gives a model whose client surfaces every 429 and
+    5xx at once, for wrappers that do their own retrying.
+    """
+    key = (model_name, sdk_retries)
+    if key not in _models:
+        client = get_client() if sdk_retries else get_client().with_options(max_retries=0)
+        _models[key] = OpenAIChatCompletionsModel(model=model_name, openai_client=client)
+    return _models[key]
+
+
+def get_adaptive_model(model_name: str = DEFAULT_MODEL) -> AdaptiveModel:
+    """Return the shared model for ``model_name`` behind adaptive concurrency, retries and a circuit breaker."""
+    if model_name not in _adaptive_models:
+        # AdaptiveModel does the retrying, so the client must surface every 429 to it.
+        _adaptive_models[model_name] = AdaptiveModel(get_model(model_name, sdk_retries=False))
+    return _adaptive_models[model_name]
+
+
+def get_config(model_name: str = DEFAULT_MODEL, adaptive: bool = False) -> RunConfig:
+    """Return a ``RunConfig`` that routes every agent to the shared model.
+
+    With ``adaptive=True`` the model is the ``AdaptiveModel`` from
+    ``get_adaptive_model``, which suits batch jobs that should find the
+    highest sustainable request rate on their own.
+    """
+    key = (model_name, adaptive)
+    if key not in _configs:
+        _configs[key] = RunConfig(
+            model=get_adaptive_model(model_name) if adaptive else get_model(model_name),
+            tracing_disabled=True,
+        )
+    return _configs[key]
+
+
+async def aclose_client() -> None:
+    """Close the shared client and drop every cached object built on it."""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
+    _configs.clear()
+    _models.clear()
+    _adaptive_models.clear()
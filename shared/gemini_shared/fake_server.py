@@ -0,0 +1,645 @@
+"""Local stand-in for the Gemini OpenAI-compatible chat-completions API.
+
+Point ``GEMINI_BASE_URL`` (or any ``AsyncOpenAI(base_url=...)``) at this
+server to run the lessons offline and deterministically:
+
+    uv run python -m gemini_shared.fake_server --port 8000 --latency 0.2
+    GEMINI_BASE_URL=http://127.0.0.1:8000/v1beta/openai/ GEMINI_API_KEY=fake uv run main.py
+
+The replies are scripted from the request itself:
+
+* if tools are offered and the last user message mentions a tool (for example
+  "weather" for ``get_weather`` or "spanish" for ``translate_to_spanish``),
+  the model calls it, with arguments generated from the tool's JSON schema;
+  several mentioned tools are called in one turn, or one per turn when the
+  request sets ``parallel_tool_calls`` to false. A tool with an ``enum``
+  argument is also called once per value the message mentions (for example
+  ``translate`` with ``target_language`` "french" and "italian");
+* once tool results are present it answers with a summary of those results;
+* with a ``json_schema`` response format it returns a JSON document matching
+  the schema;
+* otherwise it echoes the user message, padded to ``completion_tokens`` words.
+
+It also implements the batch API (``/files`` and ``/batches``): an uploaded
+JSONL file of chat-completion requests is answered the same way, in one go,
+``batch_delay`` seconds after the batch is created.
+
+Latency, token rate, 429/500 injection and a concurrency capacity are
+configured with ``FakeServerConfig``. The server is a small asyncio HTTP/1.1
+implementation with keep-alive, so it needs nothing beyond the standard
+library.
+"""
+
+import argparse
+import asyncio
+import email
+import email.policy
+import json
+import random
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+# Words that appear in many tool names and say nothing about which tool the
+# user wants.
+_STOP_WORDS = {"agent", "expert", "get", "the", "to", "tool", "transfer", "translate"}
+_TEXT_ARGS = {"input", "message", "query", "text"}
+_FILLER = "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor".split()
+
+
+@dataclass
+class FakeServerConfig:
+    latency: float = 0.0
+    """Seconds before the first byte of every response."""
+    jitter: float = 0.0
+    """Extra random latency, uniformly drawn from ``[0, jitter]``."""
+    token_rate: float = 0.0
+    """Generated tokens per second; ``0`` means instant."""
+    completion_tokens: int = 20
+    """Length, in words, of plain text replies."""
+    error_rate_429: float = 0.0
+    """Probability of answering with ``429 Too Many Requests``."""
+    error_rate_500: float = 0.0
+    """Probability of answering with ``500 Internal Server Error``."""
+    retry_after: float = 1.0
+    """Value of the ``Retry-After`` header sent with injected 429s."""
+    capacity: int = 0
+    """Requests served at once; any beyond that get a 429. ``0`` means unlimited."""
+    batch_delay: float = 1.0
+    """Seconds a batch job stays in progress before its results are ready."""
+    seed: int | None = 0
+    """Seed for latency jitter and error injection."""
+
+
+@dataclass
+class FakeServerStats:
+    requests: int = 0
+    streams: int = 0
+    tool_calls: int = 0
+    batches: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    status: dict[int, int] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "streams": self.streams,
+            "tool_calls": self.tool_calls,
+            "batches": self.batches,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "status": {str(code): count for code, count in self.status.items()},
+        }
+
+
+def count_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return max(1, len(text) // 4) if text else 0
+
+
+def _content_text(content: Any) -> str:
+    if content is None:
+        return ""
+    if isinstance(content, str):
+        return content
+    return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+
+
+def _last_user_text(messages: list[dict[str, Any]]) -> str:
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            return _content_text(message.get("content"))
+    return ""
+
+
+def _words(text: str) -> list[str]:
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+class _SchemaFiller:
+    """Builds a JSON value that satisfies a (strict) JSON schema."""
+
+    def __init__(self, root: dict[str, Any], text: str):
+        self.defs = root.get("$defs", {})
+        self.text = text
+        words = _words(text)
+        self.word = words[-1] if words else "unknown"
+        numbers = re.findall(r"\d+", text)
+        self.number = int(numbers[-1]) if numbers else 1
+
+    def fill(self, schema: dict[str, Any], name: str = "") -> Any:
+        if "$ref" in schema:
+            schema = self.defs[schema["$ref"].rsplit("/", 1)[-1]]
+        if "default" in schema:
+            return schema["default"]
+        if "enum" in schema:
+            return schema["enum"][0]
+        if "const" in schema:
+            return schema["const"]
+        for key in ("anyOf", "oneOf", "allOf"):
+            if key in schema:
+                return self.fill(schema[key][0], name)
+        kind = schema.get("type", "object")
+        if isinstance(kind, list):
+            kind = next((k for k in kind if k != "null"), "null")
+        if kind == "object":
+            return {key: self.fill(value, key) for key, value in schema.get("properties", {}).items()}
+        if kind == "array":
+            return [self.fill(schema.get("items", {}), name)]
+        if kind == "string":
+            return self.text if name in _TEXT_ARGS else self.word
+        if kind == "integer":
+            return self.number
+        if kind == "number":
+            return float(self.number)
+        if kind == "boolean":
+            return False
+        return None
+
+
+class FakeChatServer:
+    """An in-process, OpenAI-compatible chat-completions server.
+
+    Use it as an async context manager, or call ``start``/``stop``:
+
+        async with FakeChatServer(FakeServerConfig(latency=0.1)) as server:
+            client = AsyncOpenAI(api_key="fake", base_url=server.base_url)
+    """
+
+    def __init__(self, config: FakeServerConfig | None = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or FakeServerConfig()
+        self.host = host
+        self.port = port
+        self.stats = FakeServerStats()
+        self._random = random.Random(self.config.seed)
+        self._server: asyncio.Server | None = None
+        self._connections: set[asyncio.StreamWriter] = set()
+        self._ids = 0
+        self._in_flight = 0
+        self._files: dict[str, dict[str, Any]] = {}
+        self._batches: dict[str, dict[str, Any]] = {}
+        self._batch_tasks: set[asyncio.Task[None]] = set()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1beta/openai/"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        for task in list(self._batch_tasks):
+            task.cancel()
+        if self._server is not None:
+            self._server.close()
+            # Idle keep-alive connections would otherwise hold wait_closed() open.
+            for writer in list(self._connections):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "FakeChatServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        assert self._server is not None
+        print(f"Fake chat-completions server listening on {self.base_url}")
+        await self._server.serve_forever()
+
+    def reset_stats(self) -> None:
+        self.stats = FakeServerStats()
+
+    # HTTP plumbing
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections.add(writer)
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                method, path, _ = request_line.split(" ", 2)
+                headers = {}
+                for line in header_lines:
+                    if ":" in line:
+                        key, value = line.split(":", 1)
+                        headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                await self._dispatch(method, path, headers, body, writer)
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _dispatch(
+        self, method: str, path: str, headers: dict[str, str], body: bytes, writer: asyncio.StreamWriter
+    ) -> None:
+        path = path.split("?", 1)[0]
+        if method == "GET" and path.endswith("/stats"):
+            await self._send_json(writer, 200, self.stats.as_dict())
+        elif method == "POST" and path.endswith("/chat/completions"):
+            await self._chat_completions(json.loads(body or b"{}"), writer)
+        elif method == "POST" and path.endswith("/files"):
+            await self._upload_file(headers.get("content-type", ""), body, writer)
+        elif method == "GET" and (match := re.search(r"/files/([^/]+)/content$", path)):
+            await self._file_content(match[1], writer)
+        elif method == "POST" and path.endswith("/batches"):
+            await self._create_batch(json.loads(body or b"{}"), writer)
+        elif method == "GET" and (match := re.search(r"/batches/([^/]+)$", path)):
+            await self._send_batch(match[1], writer)
+        else:
+            await self._send_json(writer, 404, {"error": {"message": f"No route for {method} {path}"}})
+
+    async def _send_json(
+        self, writer: asyncio.StreamWriter, status: int, payload: dict[str, Any], extra_headers: dict[str, str] | None = None
+    ) -> None:
+        self.stats.status[status] = self.stats.status.get(status, 0) + 1
+        data = json.dumps(payload).encode()
+        headers = {"Content-Type": "application/json", "Content-Length": str(len(data)), **(extra_headers or {})}
+        writer.write(self._head(status, headers) + data)
+        await writer.drain()
+
+    @staticmethod
+    def _head(status: int, headers: dict[str, str]) -> bytes:
+        reason = {200: "OK", 404: "Not Found", 429: "Too Many Requests", 500: "Internal Server Error"}[status]
+        lines = [f"HTTP/1.1 {status} {reason}", *(f"{key}: {value}" for key, value in headers.items())]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode()
+
+    # Chat completions
+
+    async def _chat_completions(self, request: dict[str, Any], writer: asyncio.StreamWriter) -> None:
+        if self.config.capacity and self._in_flight >= self.config.capacity:
+            self.stats.requests += 1
+            await self._send_rate_limited(writer)
+            return
+        self._in_flight += 1
+        try:
+            await self._complete(request, writer)
+        finally:
+            self._in_flight -= 1
+
+    async def _send_rate_limited(self, writer: asyncio.StreamWriter) -> None:
+        await self._send_json(
+            writer,
+            429,
+            {"error": {"message": "Resource has been exhausted (fake).", "type": "rate_limit_error", "code": 429}},
+            {"Retry-After": f"{self.config.retry_after:g}"},
+        )
+
+    async def _complete(self, request: dict[str, Any], writer: asyncio.StreamWriter) -> None:
+        self.stats.requests += 1
+        config = self.config
+        delay = config.latency + (self._random.uniform(0, config.jitter) if config.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+
+        roll = self._random.random()
+        if roll < config.error_rate_429:
+            await self._send_rate_limited(writer)
+            return
+        if roll < config.error_rate_429 + config.error_rate_500:
+            await self._send_json(
+                writer, 500, {"error": {"message": "Internal error (fake).", "type": "server_error", "code": 500}}
+            )
+            return
+
+        base, text, tool_calls, finish_reason, usage = self._completion(request)
+
+        if request.get("stream"):
+            self.stats.streams += 1
+            await self._stream(writer, base, text, tool_calls, finish_reason, usage, request)
+            return
+
+        if config.token_rate:
+            await asyncio.sleep(usage["completion_tokens"] / config.token_rate)
+        await self._send_json(writer, 200, self._completion_body(base, text, tool_calls, finish_reason, usage))
+
+    def _completion(
+        self, request: dict[str, Any]
+    ) -> tuple[dict[str, Any], str, list[dict[str, Any]], str, dict[str, int]]:
+        messages = request.get("messages", [])
+        prompt_tokens = sum(count_tokens(_content_text(m.get("content"))) for m in messages)
+        prompt_tokens += count_tokens(json.dumps(request.get("tools", [])))
+        text, tool_calls = self._reply(request)
+        completion_tokens = len(text.split()) + sum(count_tokens(c["function"]["arguments"]) for c in tool_calls)
+
+        self.stats.prompt_tokens += prompt_tokens
+        self.stats.completion_tokens += completion_tokens
+        self.stats.tool_calls += len(tool_calls)
+        self._ids += 1
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        base = {"id": f"chatcmpl-fake-{self._ids}", "created": int(time.time()), "model": request.get("model", "fake")}
+        finish_reason = "tool_calls" if tool_calls else "stop"
+        return base, text, tool_calls, finish_reason, usage
+
+    @staticmethod
+    def _completion_body(
+        base: dict[str, Any], text: str, tool_calls: list[dict[str, Any]], finish_reason: str, usage: dict[str, int]
+    ) -> dict[str, Any]:
+        message: dict[str, Any] = {"role": "assistant", "content": text or None}
+        if tool_calls:
+            message["tool_calls"] = tool_calls
+        return {
+            **base,
+            "object": "chat.completion",
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+            "usage": usage,
+        }
+
+    async def _stream(
+        self,
+        writer: asyncio.StreamWriter,
+        base: dict[str, Any],
+        text: str,
+        tool_calls: list[dict[str, Any]],
+        finish_reason: str,
+        usage: dict[str, int],
+        request: dict[str, Any],
+    ) -> None:
+        self.stats.status[200] = self.stats.status.get(200, 0) + 1
+        writer.write(
+            self._head(
+                200, {"Content-Type": "text/event-stream", "Cache-Control": "no-cache", "Transfer-Encoding": "chunked"}
+            )
+        )
+
+        async def send(payload: dict[str, Any] | str) -> None:
+            data = payload if isinstance(payload, str) else json.dumps(payload)
+            event = f"data: {data}\n\n".encode()
+            writer.write(f"{len(event):x}\r\n".encode() + event + b"\r\n")
+            await writer.drain()
+
+        def chunk(delta: dict[str, Any], finish: str | None = None) -> dict[str, Any]:
+            return {
+                **base,
+                "object": "chat.completion.chunk",
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+            }
+
+        pause = 1 / self.config.token_rate if self.config.token_rate else 0.0
+        await send(chunk({"role": "assistant", "content": ""}))
+        for position, word in enumerate(text.split()):
+            if pause:
+                await asyncio.sleep(pause)
+            await send(chunk({"content": word if position == 0 else " " + word}))
+        for index, call in enumerate(tool_calls):
+            await send(chunk({"tool_calls": [{"index": index, **call}]}))
+        await send(chunk({}, finish_reason))
+        if (request.get("stream_options") or {}).get("include_usage"):
+            await send({**base, "object": "chat.completion.chunk", "choices": [], "usage": usage})
+        await send("[DONE]")
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    # Batch API
+
+    async def _upload_file(self, content_type: str, body: bytes, writer: asyncio.StreamWriter) -> None:
+        message = email.message_from_bytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode() + body, policy=email.policy.HTTP
+        )
+        fields = {part.get_param("name", header="content-disposition"): part for part in message.iter_parts()}
+        upload = fields["file"]
+        purpose = fields.get("purpose")
+        content = upload.get_payload(decode=True) or b""
+        file = self._new_file(
+            content, upload.get_filename() or "upload.jsonl", purpose.get_content().strip() if purpose else "batch"
+        )
+        await self._send_json(writer, 200, file)
+
+    def _new_file(self, content: bytes, filename: str, purpose: str) -> dict[str, Any]:
+        self._ids += 1
+        file = {
+            "id": f"file-fake-{self._ids}",
+            "object": "file",
+            "bytes": len(content),
+            "created_at": int(time.time()),
+            "filename": filename,
+            "purpose": purpose,
+            "status": "processed",
+        }
+        self._files[file["id"]] = {**file, "content": content}
+        return file
+
+    async def _file_content(self, file_id: str, writer: asyncio.StreamWriter) -> None:
+        file = self._files.get(file_id)
+        if file is None:
+            await self._send_json(writer, 404, {"error": {"message": f"No file {file_id}"}})
+            return
+        self.stats.status[200] = self.stats.status.get(200, 0) + 1
+        content = file["content"]
+        writer.write(
+            self._head(200, {"Content-Type": "application/octet-stream", "Content-Length": str(len(content))}) + content
+        )
+        await writer.drain()
+
+    async def _create_batch(self, request: dict[str, Any], writer: asyncio.StreamWriter) -> None:
+        if request.get("input_file_id") not in self._files:
+            await self._send_json(writer, 404, {"error": {"message": f"No file {request.get('input_file_id')}"}})
+            return
+        self.stats.batches += 1
+        self._ids += 1
+        batch = {
+            "id": f"batch-fake-{self._ids}",
+            "object": "batch",
+            "endpoint": request.get("endpoint", "/v1/chat/completions"),
+            "input_file_id": request["input_file_id"],
+            "completion_window": request.get("completion_window", "24h"),
+            "status": "in_progress",
+            "created_at": int(time.time()),
+            "in_progress_at": int(time.time()),
+            "metadata": request.get("metadata"),
+        }
+        self._batches[batch["id"]] = batch
+        task = asyncio.create_task(self._process_batch(batch))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+        await self._send_json(writer, 200, batch)
+
+    async def _process_batch(self, batch: dict[str, Any]) -> None:
+        await asyncio.sleep(self.config.batch_delay)
+        lines = self._files[batch["input_file_id"]]["content"].decode().splitlines()
+        outputs, errors = [], []
+        for line in filter(str.strip, lines):
+            request = json.loads(line)
+            self.stats.requests += 1
+            self._ids += 1
+            result: dict[str, Any] = {"id": f"batch_req_fake_{self._ids}", "custom_id": request["custom_id"], "error": None}
+            if self._random.random() < self.config.error_rate_500:
+                body = {"error": {"message": "Internal error (fake).", "type": "server_error", "code": 500}}
+                result["response"] = {"status_code": 500, "request_id": result["id"], "body": body}
+                errors.append(result)
+            else:
+                body = self._completion_body(*self._completion(request["body"]))
+                result["response"] = {"status_code": 200, "request_id": result["id"], "body": body}
+                outputs.append(result)
+
+        def jsonl(results: list[dict[str, Any]]) -> bytes:
+            return "".join(json.dumps(result) + "\n" for result in results).encode()
+
+        batch["output_file_id"] = self._new_file(jsonl(outputs), "output.jsonl", "batch_output")["id"]
+        if errors:
+            batch["error_file_id"] = self._new_file(jsonl(errors), "errors.jsonl", "batch_output")["id"]
+        batch["request_counts"] = {"total": len(outputs) + len(errors), "completed": len(outputs), "failed": len(errors)}
+        batch["status"] = "completed"
+        batch["completed_at"] = int(time.time())
+
+    async def _send_batch(self, batch_id: str, writer: asyncio.StreamWriter) -> None:
+        batch = self._batches.get(batch_id)
+        if batch is None:
+            await self._send_json(writer, 404, {"error": {"message": f"No batch {batch_id}"}})
+        else:
+            await self._send_json(writer, 200, batch)
+
+    def _reply(self, request: dict[str, Any]) -> tuple[str, list[dict[str, Any]]]:
+        messages = request.get("messages", [])
+        user_text = _last_user_text(messages)
+        last_role = messages[-1].get("role") if messages else "user"
+
+        if last_role == "tool" and self._after_handoff(messages):
+            # The receiving agent answers the original request from scratch.
+            last_role = "user"
+
+        if last_role != "tool":
+            tool_calls = self._pick_tool_calls(request.get("tools") or [], user_text)
+            if tool_calls:
+                return "", tool_calls[:1] if request.get("parallel_tool_calls") is False else tool_calls
+        elif request.get("parallel_tool_calls") is False:
+            # Serial tool use: call the next mentioned tool that has not run yet.
+            called = self._called_tools(messages)
+            remaining = [
+                call
+                for call in self._pick_tool_calls(request.get("tools") or [], user_text)
+                if (call["function"]["name"], call["function"]["arguments"]) not in called
+            ]
+            if remaining:
+                return "", remaining[:1]
+
+        response_format = request.get("response_format") or {}
+        if response_format.get("type") == "json_schema":
+            schema = response_format["json_schema"].get("schema", {})
+            return json.dumps(_SchemaFiller(schema, user_text).fill(schema)), []
+
+        if last_role == "tool":
+            results = []
+            for message in reversed(messages):
+                if message.get("role") != "tool":
+                    break
+                results.append(_content_text(message.get("content")))
+            return " ".join(reversed(results)), []
+
+        words = user_text.split() or ["ok"]
+        padding = self.config.completion_tokens - len(words)
+        return " ".join(words + [_FILLER[i % len(_FILLER)] for i in range(max(0, padding))]), []
+
+    @staticmethod
+    def _called_tools(messages: list[dict[str, Any]]) -> set[tuple[str, str]]:
+        """Names and arguments of the tools already called since the last user message."""
+        called = set()
+        for message in reversed(messages):
+            if message.get("role") == "user":
+                break
+            for call in message.get("tool_calls") or []:
+                called.add((call["function"]["name"], call["function"]["arguments"]))
+        return called
+
+    @staticmethod
+    def _after_handoff(messages: list[dict[str, Any]]) -> bool:
+        for message in reversed(messages):
+            if message.get("role") == "assistant":
+                calls = message.get("tool_calls") or []
+                return bool(calls) and all(c["function"]["name"].startswith("transfer_to_") for c in calls)
+        return False
+
+    def _pick_tool_calls(self, tools: list[dict[str, Any]], user_text: str) -> list[dict[str, Any]]:
+        words = _words(user_text)
+        wanted = set(words)
+        calls = []
+        for tool in tools:
+            function = tool.get("function", {})
+            name = function.get("name", "")
+            parameters = function.get("parameters") or {}
+            keywords = set(_words(name.replace("_", " "))) - _STOP_WORDS
+            if keywords and not keywords & wanted:
+                continue
+            # One call per mentioned value of an enum argument, in the order mentioned.
+            choices = [
+                {key: value}
+                for key, schema in parameters.get("properties", {}).items()
+                for value in sorted(
+                    (value for value in schema.get("enum", []) if str(value).lower() in wanted),
+                    key=lambda value: words.index(str(value).lower()),
+                )
+            ]
+            if not choices:
+                # A generic name such as "translate" is only picked through its arguments.
+                if not keywords:
+                    continue
+                choices = [{}]
+            for choice in choices:
+                arguments = _SchemaFiller(parameters, user_text).fill(parameters) | choice
+                calls.append(
+                    {
+                        "id": f"call_fake_{self._ids + 1}_{len(calls)}",
+                        "type": "function",
+                        "function": {"name": name, "arguments": json.dumps(arguments)},
+                    }
+                )
+            # A handoff ends the turn; only the first one would be followed.
+            if name.startswith("transfer_to_"):
+                break
+        return calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible chat-completions stand-in.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before the first byte")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency, in seconds")
+    parser.add_argument("--token-rate", type=float, default=0.0, help="tokens per second, 0 for instant")
+    parser.add_argument("--completion-tokens", type=int, default=20)
+    parser.add_argument("--error-rate-429", type=float, default=0.0)
+    parser.add_argument("--error-rate-500", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--capacity", type=int, default=0, help="concurrent requests before 429s, 0 for unlimited")
+    parser.add_argument("--batch-delay", type=float, default=1.0, help="seconds before a batch job completes")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = FakeServerConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        token_rate=args.token_rate,
+        completion_tokens=args.completion_tokens,
+        error_rate_429=args.error_rate_429,
+        error_rate_500=args.error_rate_500,
+        retry_after=args.retry_after,
+        capacity=args.capacity,
+        batch_delay=args.batch_delay,
+        seed=args.seed,
+    )
+    try:
+        asyncio.run(FakeChatServer(config, args.host, args.port).serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Local stand-in for the weatherapi.com ``current.json`` endpoint.
+
+    uv run python -m gemini_shared.fake_weather --port 8001 --latency 0.2
+    WEATHER_BASE_URL=http://127.0.0.1:8001/v1/ uv run agent.py
+
+Every city gets a made-up but stable temperature and condition derived from
+its name, so repeated runs give the same answers. A ``q`` of ``nowhere`` (or
+an empty one) gets the API's "No matching location found." error. Latency
+and a 500 error rate are configurable, and ``stats`` counts requests per city,
+which is how tests see whether a cache or de-duplication saved a call.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+_CONDITIONS = ["Sunny", "Partly cloudy", "Cloudy", "Overcast", "Mist", "Light rain", "Moderate rain", "Haze"]
+
+
+@dataclass
+class FakeWeatherStats:
+    requests: int = 0
+    errors: int = 0
+    cities: Counter[str] = field(default_factory=Counter)
+
+
+def fake_current(city: str) -> dict[str, Any]:
+    digest = hashlib.sha256(city.casefold().encode()).digest()
+    temp_c = round(-5 + digest[0] / 255 * 45, 1)
+    return {
+        "temp_c": temp_c,
+        "temp_f": round(temp_c * 9 / 5 + 32, 1),
+        "humidity": digest[1] % 100,
+        "wind_kph": round(digest[2] / 255 * 40, 1),
+        "condition": {"text": _CONDITIONS[digest[3] % len(_CONDITIONS)]},
+    }
+
+
+class FakeWeatherServer:
+    def __init__(
+        self,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        seed: int | None = 0,
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.host = host
+        self.port = port
+        self.stats = FakeWeatherStats()
+        self._random = random.Random(seed)
+        self._server: asyncio.Server | None = None
+        self._connections: set[asyncio.StreamWriter] = set()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1/"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._connections):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "FakeWeatherServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        assert self._server is not None
+        print(f"Fake weather server listening on {self.base_url}")
+        await self._server.serve_forever()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections.add(writer)
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                _, target, _ = request_line.split(" ", 2)
+                headers = {
+                    key.strip().lower(): value.strip()
+                    for key, value in (line.split(":", 1) for line in header_lines if ":" in line)
+                }
+                await reader.readexactly(int(headers.get("content-length", 0)))
+                status, payload = await self._current(target)
+                data = json.dumps(payload).encode()
+                reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}[status]
+                writer.write(
+                    f"HTTP/1.1 {status} {reason}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n\r\n".encode()
+                    + data
+                )
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _current(self, target: str) -> tuple[int, dict[str, Any]]:
+        url = urlsplit(target)
+        if not url.path.endswith("/current.json"):
+            return 404, {"error": {"code": 404, "message": f"No route for {url.path}"}}
+        city = " ".join(parse_qs(url.query).get("q", [""])[0].split())
+        self.stats.requests += 1
+        self.stats.cities[city.casefold()] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self._random.random() < self.error_rate:
+            self.stats.errors += 1
+            return 500, {"error": {"code": 9999, "message": "Internal application error (fake)."}}
+        if not city or city.casefold() == "nowhere":
+            return 400, {"error": {"code": 1006, "message": "No matching location found."}}
+        return 200, {"location": {"name": city.title()}, "current": fake_current(city)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local weatherapi.com current.json stand-in.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before every answer")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability of a 500")
+    args = parser.parse_args()
+    try:
+        asyncio.run(FakeWeatherServer(args.latency, args.error_rate, args.host, args.port).serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""A long-lived event loop on a background thread.
+
+``asyncio.run`` creates and tears down an event loop on every call, and a
+pooled ``AsyncOpenAI`` client cannot outlive the loop its connections were
+opened on. Sync callers (Streamlit reruns, scripts, web handlers) can instead
+hand their coroutines to one ``BackgroundLoop`` that lives for the whole
+process, so loop setup and connection setup are paid once.
+"""
+
+import asyncio
+import queue
+import threading
+from collections.abc import AsyncIterator, Coroutine, Iterator
+from concurrent.futures import Future
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class BackgroundLoop:
+    def __init__(self, name: str = "gemini-shared-loop"):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> Future[T]:
+        """Schedule ``coro`` on the loop and return a concurrent future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+        """Run ``coro`` on the loop and block until it returns."""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("BackgroundLoop.run() cannot be called from the loop's own thread.")
+        return self.submit(coro).result(timeout)
+
+    def iterate(self, items: AsyncIterator[T]) -> Iterator[T]:
+        """Consume an async iterator on the loop and yield its items here.
+
+        Items are handed over through a thread-safe queue as soon as they are
+        produced, which lets sync code (a Streamlit script, for example)
+        render a ``Runner.run_streamed`` response token by token. Closing the
+        returned iterator early cancels the consumer on the loop.
+        """
+        handoff: queue.Queue[tuple[str, Any]] = queue.Queue()
+
+        async def pump() -> None:
+            try:
+                async for item in items:
+                    handoff.put(("item", item))
+            except Exception as exc:
+                handoff.put(("error", exc))
+            finally:
+                handoff.put(("done", None))
+
+        future = self.submit(pump())
+        try:
+            while True:
+                kind, value = handoff.get()
+                if kind == "done":
+                    break
+                if kind == "error":
+                    raise value
+                yield value
+        finally:
+            future.cancel()
+
+    def stop(self) -> None:
+        if self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join()
+        self.loop.close()
@@ -0,0 +1,183 @@
+"""Run single-turn agent requests through the provider's batch API.
+
+Batch jobs are cheaper than interactive calls and are not limited by the
+per-minute quotas, at the cost of finishing minutes to hours later. That suits
+bulk work such as translating a catalogue. ``OfflineBatchRunner`` turns
+``(agent, input)`` pairs into a chat-completions batch JSONL file (system
+prompt, input, output schema and model settings, exactly as ``Runner.run``
+would send them), uploads it, creates the batch, polls it and maps each line
+of the results back to an ``OfflineRunResult``, which has the
+``final_output``, ``raw_responses`` and usage a ``RunResult`` would have.
+
+Only agents that answer in one model call can be batched: anything with tools,
+handoffs or guardrails needs the ``Runner`` loop.
+
+    runner = OfflineBatchRunner()
+    results = await runner.run([(spanish_agent, text) for text in texts])
+
+``FakeChatServer`` implements the same ``/files`` and ``/batches`` endpoints,
+so this works offline against ``GEMINI_BASE_URL`` pointed at it.
+"""
+
+import asyncio
+import json
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Any, TypeVar, cast
+
+from agents import Agent, ItemHelpers, ModelResponse, RunContextWrapper, Usage
+from agents.agent_output import AgentOutputSchema, AgentOutputSchemaBase
+from agents.items import TResponseInputItem
+from agents.models.chatcmpl_converter import Converter
+from openai import AsyncOpenAI
+from openai.types import Batch
+from openai.types.chat import ChatCompletion
+
+from .client import DEFAULT_MODEL, get_client
+
+T = TypeVar("T")
+
+OfflineJob = tuple[Agent[Any], str | list[TResponseInputItem]]
+
+_DONE = {"completed", "failed", "expired", "cancelled"}
+
+
+@dataclass
+class OfflineRunResult:
+    input: str | list[TResponseInputItem]
+    last_agent: Agent[Any]
+    final_output: Any = None
+    raw_responses: list[ModelResponse] = field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def usage(self) -> Usage:
+        usage = Usage()
+        for response in self.raw_responses:
+            usage.add(response.usage)
+        return usage
+
+    def final_output_as(self, cls: type[T], raise_if_incorrect_type: bool = False) -> T:
+        if raise_if_incorrect_type and not isinstance(self.final_output, cls):
+            raise TypeError(f"Final output is not of type {cls.__name__}")
+        return cast(T, self.final_output)
+
+
+def _output_schema(agent: Agent[Any]) -> AgentOutputSchemaBase | None:
+    # Same rule as the Runner.
+    if agent.output_type is None or agent.output_type is str:
+        return None
+    if isinstance(agent.output_type, AgentOutputSchemaBase):
+        return agent.output_type
+    return AgentOutputSchema(agent.output_type)
+
+
+def _model_name(agent: Agent[Any]) -> str:
+    if isinstance(agent.model, str):
+        return agent.model
+    # OpenAIChatCompletionsModel keeps its model name in ``.model``.
+    return getattr(agent.model, "model", None) or DEFAULT_MODEL
+
+
+async def batch_request(agent: Agent[Any], input: str | list[TResponseInputItem], custom_id: str) -> dict[str, Any]:
+    """One line of a chat-completions batch file for a single turn of ``agent``."""
+    if agent.tools or agent.handoffs or agent.input_guardrails or agent.output_guardrails:
+        raise ValueError(f"{agent.name} uses tools, handoffs or guardrails and cannot be answered in one batch request")
+
+    messages: list[Any] = Converter.items_to_messages(input)
+    system_prompt = await agent.get_system_prompt(RunContextWrapper(context=None))
+    if system_prompt:
+        messages.insert(0, {"role": "system", "content": system_prompt})
+    body: dict[str, Any] = {"model": _model_name(agent), "messages": messages}
+
+    response_format = Converter.convert_response_format(_output_schema(agent))
+    if response_format:
+        body["response_format"] = response_format
+    settings = agent.model_settings
+    for name in ("temperature", "top_p", "frequency_penalty", "presence_penalty", "max_tokens"):
+        if (value := getattr(settings, name)) is not None:
+            body[name] = value
+    return {"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": body}
+
+
+class OfflineBatchRunner:
+    def __init__(
+        self,
+        client: AsyncOpenAI | None = None,
+        poll_interval: float = 30.0,
+        completion_window: str = "24h",
+    ):
+        self.client = client or get_client()
+        self.poll_interval = poll_interval
+        self.completion_window = completion_window
+
+    async def submit(self, jobs: Sequence[OfflineJob]) -> Batch:
+        """Upload ``jobs`` as a batch file and start the batch."""
+        lines = [await batch_request(agent, input, str(index)) for index, (agent, input) in enumerate(jobs)]
+        content = "".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines).encode()
+        upload = await self.client.files.create(file=("batch.jsonl", content), purpose="batch")
+        return await self.client.batches.create(
+            input_file_id=upload.id,
+            endpoint="/v1/chat/completions",
+            completion_window=cast(Any, self.completion_window),
+        )
+
+    async def wait(self, batch_id: str, timeout: float | None = None) -> Batch:
+        """Poll until the batch is finished (completed, failed, expired or cancelled)."""
+        started = time.monotonic()
+        while True:
+            batch = await self.client.batches.retrieve(batch_id)
+            if batch.status in _DONE:
+                return batch
+            if timeout is not None and time.monotonic() - started > timeout:
+                raise TimeoutError(f"Batch {batch_id} still {batch.status} after {timeout:.0f}s")
+            await asyncio.sleep(self.poll_interval)
+
+    async def results(self, batch: Batch, jobs: Sequence[OfflineJob]) -> list[OfflineRunResult]:
+        """Map a finished batch's output back to one result per job, in job order."""
+        results = [OfflineRunResult(input=input, last_agent=agent) for agent, input in jobs]
+        lines: list[dict[str, Any]] = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                content = await self.client.files.content(file_id)
+                lines.extend(json.loads(line) for line in content.text.splitlines() if line.strip())
+
+        seen: set[int] = set()
+        for line in lines:
+            index = int(line["custom_id"])
+            seen.add(index)
+            self._fill(results[index], line)
+        for index in set(range(len(jobs))) - seen:
+            results[index].error = f"No result: batch {batch.id} is {batch.status}"
+        return results
+
+    async def run(self, jobs: Sequence[OfflineJob], timeout: float | None = None) -> list[OfflineRunResult]:
+        """Submit ``jobs``, wait for the batch and return its results."""
+        batch = await self.submit(jobs)
+        batch = await self.wait(batch.id, timeout)
+        return await self.results(batch, jobs)
+
+    @staticmethod
+    def _fill(result: OfflineRunResult, line: dict[str, Any]) -> None:
+        response = line.get("response") or {}
+        if line.get("error") or response.get("status_code") != 200:
+            error = line.get("error") or response.get("body", {}).get("error") or {}
+            result.error = error.get("message", json.dumps(error)) if isinstance(error, dict) else str(error)
+            return
+
+        completion = ChatCompletion.model_validate(response["body"])
+        usage = Usage(requests=1)
+        if completion.usage:
+            usage.input_tokens = completion.usage.prompt_tokens
+            usage.output_tokens = completion.usage.completion_tokens
+            usage.total_tokens = completion.usage.total_tokens
+        output = Converter.message_to_output_items(completion.choices[0].message)
+        result.raw_responses.append(ModelResponse(output=output, usage=usage, response_id=None))
+
+        text = "".join(ItemHelpers.extract_last_text(item) or "" for item in output)
+        schema = _output_schema(result.last_agent)
+        try:
+            result.final_output = schema.validate_json(text) if schema else text
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
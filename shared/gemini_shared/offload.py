@@ -0,0 +1,175 @@
+"""Run sync tool functions on a dedicated thread pool.
+
+The Agents SDK calls a sync ``function_tool`` function directly on the event
+loop, so a tool that does blocking I/O or heavy computation stalls every other
+run in the process while it works. ``offload`` turns a sync function into an
+async one that runs the original in a thread pool of its own, bounded to
+``workers`` threads.
+
+The lessons import ``function_tool`` from ``gemini_shared`` instead of
+``agents``. It takes the same arguments and offloads every sync function it
+decorates, so a sync tool added later cannot block the loop by accident:
+
+    @function_tool
+    def lookup(order_id: str) -> str: ...
+
+    @function_tool(workers=8, timeout=10)
+    def search(query: str) -> str: ...
+
+``offload`` can also be used on its own, under ``agents.function_tool``.
+Async functions are returned unchanged, so they keep running on the loop.
+Each offloaded function gets its own pool, so a slow tool can only exhaust
+its own threads. ``timeout`` bounds the whole call in seconds, including the
+time spent waiting for a free thread. A thread cannot be interrupted, so a
+timed-out call keeps its thread until it returns. Counters per function,
+including how long calls waited for a thread, are kept in ``offload_stats``.
+"""
+
+import asyncio
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, ParamSpec, TypeVar, overload
+
+import agents
+from agents import FunctionTool
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+@dataclass
+class OffloadStats:
+    calls: int = 0
+    started: int = 0
+    completed: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    running: int = 0
+    queued: int = 0
+    max_queued: int = 0
+    total_queue_wait: float = 0.0
+    max_queue_wait: float = 0.0
+    total_run_time: float = 0.0
+
+    @property
+    def average_queue_wait(self) -> float:
+        return self.total_queue_wait / self.started if self.started else 0.0
+
+
+offload_stats: dict[str, OffloadStats] = {}
+
+
+@overload
+def offload(func: Callable[P, T], /) -> Callable[P, Awaitable[T]]: ...
+
+
+@overload
+def offload(
+    *, workers: int = 4, timeout: float | None = None
+) -> Callable[[Callable[P, T]], Callable[P, Awaitable[T]]]: ...
+
+
+def offload(
+    func: Callable[P, T] | None = None,
+    /,
+    *,
+    workers: int = 4,
+    timeout: float | None = None,
+) -> Any:
+    """Run a sync function in a dedicated pool of ``workers`` threads."""
+
+    def decorate(func: Callable[P, T]) -> Callable[P, Awaitable[T]]:
+        if inspect.iscoroutinefunction(func):
+            return func
+        name = func.__qualname__
+        stats = offload_stats.setdefault(name, OffloadStats())
+        pool: ThreadPoolExecutor | None = None
+        # Counters are updated from the loop and from the pool's threads.
+        lock = threading.Lock()
+
+        def run(submitted: float, context: contextvars.Context, args: Any, kwargs: Any) -> T:
+            started = time.perf_counter()
+            with lock:
+                stats.queued -= 1
+                stats.started += 1
+                stats.running += 1
+                stats.total_queue_wait += started - submitted
+                stats.max_queue_wait = max(stats.max_queue_wait, started - submitted)
+            try:
+                # The caller's context, so tracing spans and context variables carry over.
+                return context.run(func, *args, **kwargs)
+            finally:
+                with lock:
+                    stats.running -= 1
+                    stats.total_run_time += time.perf_counter() - started
+
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            nonlocal pool
+            if pool is None:
+                pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"tool-{func.__name__}")
+            with lock:
+                stats.calls += 1
+                stats.queued += 1
+                stats.max_queued = max(stats.max_queued, stats.queued)
+            call = pool.submit(run, time.perf_counter(), contextvars.copy_context(), args, kwargs)
+            try:
+                result = await asyncio.wait_for(asyncio.wrap_future(call), timeout)
+            except TimeoutError:
+                with lock:
+                    stats.timeouts += 1
+                raise TimeoutError(f"{func.__name__} did not finish within {timeout:g}s") from None
+            except Exception:
+                with lock:
+                    stats.errors += 1
+                raise
+            finally:
+                # Given up on before a thread picked it up: it will never run.
+                if call.cancelled():
+                    with lock:
+                        stats.queued -= 1
+            with lock:
+                stats.completed += 1
+            return result
+
+        wrapper.stats = stats  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorate(func) if func is not None else decorate
+
+
+@overload
+def function_tool(func: Callable[..., Any], /) -> FunctionTool: ...
+
+
+@overload
+def function_tool(
+    func: None = None, /, *, workers: int = 4, timeout: float | None = None, **kwargs: Any
+) -> Callable[[Callable[..., Any]], FunctionTool]: ...
+
+
+def function_tool(
+    func: Callable[..., Any] | None = None,
+    /,
+    *,
+    workers: int = 4,
+    timeout: float | None = None,
+    **kwargs: Any,
+) -> Any:
+    """``agents.function_tool`` that runs sync functions through ``offload``.
+
+    ``workers`` and ``timeout`` go to ``offload``; everything else goes to
+    ``agents.function_tool``.
+    """
+
+    def decorate(func: Callable[..., Any]) -> FunctionTool:
+        return agents.function_tool(offload(workers=workers, timeout=timeout)(func), **kwargs)
+
+    # Like agents.function_tool, anything but a function means "called with arguments".
+    return decorate(func) if callable(func) else decorate
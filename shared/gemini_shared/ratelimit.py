@@ -0,0 +1,177 @@
+"""Token-bucket rate limiting matched to per-minute provider quotas.
+
+Gemini quotas are counted in requests per minute (RPM) and tokens per minute
+(TPM). ``TokenBucket`` hands out capacity at a steady per-minute rate with a
+small burst allowance, and ``RateLimitedModel`` wraps a model so every request
+takes one unit from an RPM bucket and its estimated tokens from a TPM bucket
+before it is sent. Once the response reports its real usage the TPM bucket is
+corrected, so estimates only have to be roughly right.
+
+    limited = RateLimitedModel(get_model(sdk_retries=False), rpm=TokenBucket(15), tpm=TokenBucket(1_000_000))
+    config = RunConfig(model=AdaptiveModel(limited))
+"""
+
+import asyncio
+import json
+import multiprocessing
+import time
+from collections.abc import AsyncIterator
+from typing import Any
+
+from agents.items import ModelResponse, TResponseStreamEvent
+from agents.models.interface import Model
+
+
+class TokenBucket:
+    def __init__(self, per_minute: float, burst: float | None = None):
+        self.rate = per_minute / 60
+        # Default burst: six seconds' worth, so a fresh bucket cannot spend a whole minute at once.
+        self.capacity = burst if burst is not None else max(per_minute / 10, 1.0)
+        self.tokens = self.capacity
+        self.waited = 0.0
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """Wait until ``amount`` can be spent, then spend it.
+
+        Requests larger than the burst wait for a full bucket and leave it in
+        debt, which later requests pay off.
+        """
+        # The lock makes waiters take turns in arrival order.
+        async with self._lock:
+            started = time.monotonic()
+            while (delay := self._take(amount)) > 0:
+                await asyncio.sleep(delay)
+            self.waited += time.monotonic() - started
+
+    def _take(self, amount: float) -> float:
+        """Spend ``amount`` if the bucket allows it now; otherwise return how long to wait."""
+        self._refill()
+        needed = min(amount, self.capacity)
+        if self.tokens >= needed:
+            self.tokens -= amount
+            return 0.0
+        return (needed - self.tokens) / self.rate
+
+    def adjust(self, amount: float) -> None:
+        """Spend ``amount`` more (or refund it, if negative) without waiting."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class SharedTokenBucket(TokenBucket):
+    """A ``TokenBucket`` whose balance lives in shared memory.
+
+    Pass it to worker processes when they start (as a ``Process`` argument) and
+    they all draw on one budget. Within a process waiters still queue in
+    order; across processes they poll the shared balance.
+    """
+
+    def __init__(self, per_minute: float, burst: float | None = None, context: Any = None):
+        super().__init__(per_minute, burst)
+        context = context or multiprocessing.get_context("spawn")
+        # [tokens, last refill time]; time.monotonic() is the same clock in every process.
+        self._shared = context.Array("d", [self.capacity, time.monotonic()])
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = asyncio.Lock()
+
+    def _take(self, amount: float) -> float:
+        with self._shared.get_lock():
+            tokens = self._refill_shared()
+            needed = min(amount, self.capacity)
+            if tokens >= needed:
+                self._shared[0] = tokens - amount
+                return 0.0
+            return (needed - tokens) / self.rate
+
+    def adjust(self, amount: float) -> None:
+        with self._shared.get_lock():
+            self._shared[0] = min(self.capacity, self._refill_shared() - amount)
+
+    def _refill_shared(self) -> float:
+        now = time.monotonic()
+        tokens = min(self.capacity, self._shared[0] + (now - self._shared[1]) * self.rate)
+        self._shared[0], self._shared[1] = tokens, now
+        return tokens
+
+
+def estimate_tokens(*parts: Any) -> int:
+    """Cheap token estimate (about four characters per token)."""
+    return sum(len(part if isinstance(part, str) else json.dumps(part, default=str)) for part in parts) // 4 + 1
+
+
+class RateLimitedModel(Model):
+    def __init__(
+        self,
+        model: Model,
+        rpm: TokenBucket | None = None,
+        tpm: TokenBucket | None = None,
+        output_tokens_estimate: int = 512,
+    ):
+        self.model = model
+        self.rpm = rpm
+        self.tpm = tpm
+        self.output_tokens_estimate = output_tokens_estimate
+
+    async def _admit(self, args: tuple[Any, ...], kwargs: dict[str, Any]) -> int:
+        estimate = 0
+        if self.tpm is not None:
+            system_instructions = kwargs.get("system_instructions", args[0] if args else None)
+            input = kwargs.get("input", args[1] if len(args) > 1 else "")
+            estimate = estimate_tokens(system_instructions or "", input) + self.output_tokens_estimate
+            await self.tpm.acquire(estimate)
+        if self.rpm is not None:
+            try:
+                await self.rpm.acquire()
+            except BaseException:
+                self._refund(estimate)
+                raise
+        return estimate
+
+    def _settle(self, estimate: int, usage: Any) -> None:
+        total = getattr(usage, "total_tokens", 0)
+        if self.tpm is not None and total:
+            self.tpm.adjust(total - estimate)
+
+    def _refund(self, estimate: int) -> None:
+        # A failed or abandoned request reports no usage; without this, every
+        # retry of it would take another full estimate out of the bucket.
+        if self.tpm is not None and estimate:
+            self.tpm.adjust(-estimate)
+
+    async def get_response(self, *args: Any, **kwargs: Any) -> ModelResponse:
+        estimate = await self._admit(args, kwargs)
+        try:
+            response = await self.model.get_response(*args, **kwargs)
+        except BaseException:
+            self._refund(estimate)
+            raise
+        self._settle(estimate, response.usage)
+        return response
+
+    async def stream_response(self, *args: Any, **kwargs: Any) -> AsyncIterator[TResponseStreamEvent]:
+        estimate = await self._admit(args, kwargs)
+        settled = False
+        try:
+            async for event in self.model.stream_response(*args, **kwargs):
+                if event.type == "response.completed":
+                    self._settle(estimate, event.response.usage)
+                    settled = True
+                yield event
+        finally:
+            # Failed, cancelled or closed before it completed.
+            if not settled:
+                self._refund(estimate)
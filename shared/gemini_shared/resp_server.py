@@ -0,0 +1,233 @@
+"""Local stand-in for a Redis server.
+
+Speaks enough of the Redis protocol (RESP) for ``RedisSessionBackend`` and
+``redis-cli``: lists, hashes, ``MULTI``/``EXEC`` and a few housekeeping
+commands, with everything held in memory. Start one and point several chat
+workers at it to share sessions without installing Redis:
+
+    uv run python -m gemini_shared.resp_server --port 6380
+    SESSION_BACKEND=redis://127.0.0.1:6380 uv run chainlit run agent.py --port 8001
+"""
+
+import argparse
+import asyncio
+from typing import Any
+
+
+class RespError(Exception):
+    """An error reply from a Redis-protocol server."""
+
+
+def encode(value: Any) -> bytes:
+    """Encode a reply in RESP2."""
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, RespError):
+        return b"-" + str(value).encode() + b"\r\n"
+    if isinstance(value, bool):
+        return b":" + (b"1" if value else b"0") + b"\r\n"
+    if isinstance(value, int):
+        return b":" + str(value).encode() + b"\r\n"
+    if isinstance(value, str) and value in ("OK", "QUEUED", "PONG"):
+        return b"+" + value.encode() + b"\r\n"
+    if isinstance(value, str):
+        value = value.encode()
+    if isinstance(value, bytes):
+        return b"$" + str(len(value)).encode() + b"\r\n" + value + b"\r\n"
+    return b"*" + str(len(value)).encode() + b"\r\n" + b"".join(encode(item) for item in value)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    """Read one RESP2 value; error replies are returned as ``RespError``."""
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("Connection closed")
+    kind, rest = line[:1], line[1:-2]
+    if kind == b"+":
+        return rest.decode()
+    if kind == b"-":
+        return RespError(rest.decode())
+    if kind == b":":
+        return int(rest)
+    if kind == b"$":
+        length = int(rest)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if kind == b"*":
+        length = int(rest)
+        if length < 0:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise RespError(f"Unknown reply type {kind!r}")
+
+
+class RespServer:
+    """An in-process, in-memory Redis-protocol server.
+
+        async with RespServer() as server:
+            backend = RedisSessionBackend(port=server.port)
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self.data: dict[bytes, Any] = {}
+        self._server: asyncio.Server | None = None
+        self._connections: set[asyncio.StreamWriter] = set()
+
+    @property
+    def url(self) -> str:
+        return f"redis://{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._connections):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "RespServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        assert self._server is not None
+        print(f"Redis-protocol stand-in listening on {self.url}")
+        await self._server.serve_forever()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections.add(writer)
+        queued: list[list[bytes]] | None = None
+        try:
+            while True:
+                try:
+                    command = await read_reply(reader)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                if not isinstance(command, list) or not command:
+                    writer.write(encode(RespError("ERR expected a command array")))
+                    continue
+                name = command[0].upper()
+                if name == b"MULTI":
+                    queued = []
+                    reply: Any = "OK"
+                elif name == b"EXEC":
+                    # Commands run one at a time on the loop, so a transaction is atomic.
+                    reply = [self._execute(queued_command) for queued_command in queued or []]
+                    queued = None
+                elif name == b"DISCARD":
+                    queued = None
+                    reply = "OK"
+                elif queued is not None:
+                    queued.append(command)
+                    reply = "QUEUED"
+                else:
+                    reply = self._execute(command)
+                writer.write(encode(reply))
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    def _execute(self, command: list[bytes]) -> Any:
+        name, *args = command
+        handler = getattr(self, "_cmd_" + name.decode().lower(), None)
+        if handler is None:
+            return RespError(f"ERR unknown command '{name.decode()}'")
+        try:
+            return handler(*args)
+        except RespError as exc:
+            return exc
+        except TypeError:
+            return RespError(f"ERR wrong number of arguments for '{name.decode()}'")
+
+    def _typed(self, key: bytes, kind: type) -> Any:
+        value = self.data.get(key)
+        if value is not None and not isinstance(value, kind):
+            raise RespError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    # Commands
+
+    def _cmd_ping(self) -> str:
+        return "PONG"
+
+    def _cmd_select(self, index: bytes) -> str:
+        # One keyspace for every database number.
+        return "OK"
+
+    def _cmd_flushall(self) -> str:
+        self.data.clear()
+        return "OK"
+
+    def _cmd_del(self, *keys: bytes) -> int:
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def _cmd_rpush(self, key: bytes, *values: bytes) -> Any:
+        items = self._typed(key, list)
+        if items is None:
+            items = self.data[key] = []
+        items.extend(values)
+        return len(items)
+
+    def _cmd_llen(self, key: bytes) -> int:
+        return len(self._typed(key, list) or [])
+
+    def _cmd_lrange(self, key: bytes, start: bytes, stop: bytes) -> list[bytes]:
+        items = self._typed(key, list) or []
+        first, last = int(start), int(stop)
+        first = max(first + len(items) if first < 0 else first, 0)
+        last = last + len(items) if last < 0 else last
+        return items[first : last + 1]
+
+    def _cmd_hset(self, key: bytes, *pairs: bytes) -> int:
+        if not pairs or len(pairs) % 2:
+            raise TypeError
+        fields = self._typed(key, dict)
+        if fields is None:
+            fields = self.data[key] = {}
+        added = 0
+        for field, value in zip(pairs[::2], pairs[1::2]):
+            added += field not in fields
+            fields[field] = value
+        return added
+
+    def _cmd_hgetall(self, key: bytes) -> list[bytes]:
+        fields = self._typed(key, dict) or {}
+        return [item for pair in fields.items() for item in pair]
+
+    def _cmd_hincrby(self, key: bytes, field: bytes, amount: bytes) -> int:
+        fields = self._typed(key, dict)
+        if fields is None:
+            fields = self.data[key] = {}
+        value = int(fields.get(field, b"0")) + int(amount)
+        fields[field] = str(value).encode()
+        return value
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="In-memory Redis-protocol stand-in.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6380)
+    args = parser.parse_args()
+    try:
+        asyncio.run(RespServer(args.host, args.port).serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""Shared, append-only chat session backends.
+
+A chat history kept in process memory ties every user to one worker process.
+These backends keep it where several workers can reach it, as an append-only
+log per session plus a small record with the rolling summary:
+
+* ``SQLiteSessionBackend``: one SQLite file in WAL mode, for workers on one
+  machine;
+* ``RedisSessionBackend``: a Redis server, or the ``resp_server`` stand-in.
+
+Each turn appends only its new messages; nothing rewrites the whole history.
+``load`` returns the summary and just the messages it does not cover yet.
+``get_session_backend`` builds one from a URL such as ``sqlite:///sessions.db``
+or ``redis://127.0.0.1:6380/0``.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any
+from urllib.parse import urlparse
+
+from .resp_server import RespError, encode, read_reply
+
+Message = dict[str, Any]
+
+
+@dataclass
+class SessionSnapshot:
+    summary: str = ""
+    covered: int = 0
+    """Number of leading messages the summary stands in for."""
+    messages: list[Message] = field(default_factory=list)
+    """The messages after ``covered``, oldest first."""
+    full_tokens: int = 0
+    """Tokens of the whole log, summarized or not."""
+
+    @property
+    def total(self) -> int:
+        return self.covered + len(self.messages)
+
+
+def _arg(value: Any) -> bytes:
+    return value if isinstance(value, bytes) else str(value).encode()
+
+
+class SessionBackend(ABC):
+    @abstractmethod
+    async def append(self, session_id: str, messages: list[Message], tokens: int) -> int:
+        """Append one turn's messages and return the new length of the log."""
+
+    @abstractmethod
+    async def load(self, session_id: str) -> SessionSnapshot:
+        """The summary and the messages it does not cover yet."""
+
+    @abstractmethod
+    async def length(self, session_id: str) -> int:
+        """Number of messages in the log."""
+
+    @abstractmethod
+    async def set_summary(self, session_id: str, summary: str, covered: int) -> None:
+        """Store the rolling summary of the first ``covered`` messages."""
+
+    async def close(self) -> None:
+        pass
+
+
+class SQLiteSessionBackend(SessionBackend):
+    """Session logs in one SQLite file, shared by processes on the same machine.
+
+    WAL mode lets readers in every worker run alongside the single writer.
+    Queries run on a worker thread so they never block the event loop.
+    """
+
+    def __init__(self, path: str = "sessions.db"):
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS chat_sessions (session_id TEXT PRIMARY KEY, "
+            "summary TEXT NOT NULL DEFAULT '', covered INTEGER NOT NULL DEFAULT 0, "
+            "total INTEGER NOT NULL DEFAULT 0, full_tokens INTEGER NOT NULL DEFAULT 0)"
+        )
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS chat_messages (session_id TEXT NOT NULL, seq INTEGER NOT NULL, "
+            "message TEXT NOT NULL, PRIMARY KEY (session_id, seq))"
+        )
+        self._lock = threading.Lock()
+
+    def _append(self, session_id: str, messages: list[Message], tokens: int) -> int:
+        with self._lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                self.db.execute("INSERT OR IGNORE INTO chat_sessions (session_id) VALUES (?)", (session_id,))
+                (start,) = self.db.execute(
+                    "SELECT total FROM chat_sessions WHERE session_id = ?", (session_id,)
+                ).fetchone()
+                self.db.executemany(
+                    "INSERT INTO chat_messages (session_id, seq, message) VALUES (?, ?, ?)",
+                    [(session_id, start + i, json.dumps(message)) for i, message in enumerate(messages)],
+                )
+                self.db.execute(
+                    "UPDATE chat_sessions SET total = total + ?, full_tokens = full_tokens + ? WHERE session_id = ?",
+                    (len(messages), tokens, session_id),
+                )
+                self.db.execute("COMMIT")
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+        return start + len(messages)
+
+    def _load(self, session_id: str) -> SessionSnapshot:
+        with self._lock:
+            row = self.db.execute(
+                "SELECT summary, covered, full_tokens FROM chat_sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+            if row is None:
+                return SessionSnapshot()
+            summary, covered, full_tokens = row
+            rows = self.db.execute(
+                "SELECT message FROM chat_messages WHERE session_id = ? AND seq >= ? ORDER BY seq",
+                (session_id, covered),
+            ).fetchall()
+        return SessionSnapshot(summary, covered, [json.loads(message) for (message,) in rows], full_tokens)
+
+    def _length(self, session_id: str) -> int:
+        with self._lock:
+            row = self.db.execute("SELECT total FROM chat_sessions WHERE session_id = ?", (session_id,)).fetchone()
+        return row[0] if row else 0
+
+    def _set_summary(self, session_id: str, summary: str, covered: int) -> None:
+        with self._lock:
+            self.db.execute(
+                "UPDATE chat_sessions SET summary = ?, covered = ? WHERE session_id = ?",
+                (summary, covered, session_id),
+            )
+
+    async def append(self, session_id: str, messages: list[Message], tokens: int) -> int:
+        return await asyncio.to_thread(self._append, session_id, messages, tokens)
+
+    async def load(self, session_id: str) -> SessionSnapshot:
+        return await asyncio.to_thread(self._load, session_id)
+
+    async def length(self, session_id: str) -> int:
+        return await asyncio.to_thread(self._length, session_id)
+
+    async def set_summary(self, session_id: str, summary: str, covered: int) -> None:
+        await asyncio.to_thread(self._set_summary, session_id, summary, covered)
+
+    async def close(self) -> None:
+        self.db.close()
+
+
+class RedisSessionBackend(SessionBackend):
+    """Session logs in Redis: a list of messages and a hash with the summary.
+
+    Uses a minimal RESP client over one connection, so it works with a real
+    Redis server or with ``python -m gemini_shared.resp_server``. Reads are
+    retried once on a new connection if the old one drops; writes are not,
+    since the lost reply may belong to a write that already ran.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 6379, db: int = 0, prefix: str = "chat"):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.prefix = prefix
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._lock = asyncio.Lock()
+        # session id -> where its summary ended at the last load
+        self._covered: dict[str, int] = {}
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        if self.db:
+            await self._send([["SELECT", self.db]])
+
+    async def _send(self, commands: list[list[Any]]) -> list[Any]:
+        assert self._reader is not None and self._writer is not None
+        # Pipeline: write every command, then read every reply.
+        self._writer.write(b"".join(encode([_arg(arg) for arg in command]) for command in commands))
+        await self._writer.drain()
+        replies = [await read_reply(self._reader) for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+
+    async def execute(self, *commands: list[Any], retry: bool = False) -> list[Any]:
+        """Send ``commands`` as one pipeline and return their replies.
+
+        Only pass ``retry=True`` for read-only commands: a write whose reply was
+        lost may already have run, and sending it again would apply it twice.
+        """
+        async with self._lock:
+            if self._writer is None or self._writer.is_closing():
+                await self._connect()
+            try:
+                return await self._send(list(commands))
+            except (ConnectionError, asyncio.IncompleteReadError):
+                # The connection is in an unknown state; the next call opens a new one.
+                self._writer.close()
+                self._writer = None
+                if not retry:
+                    raise
+                # Reconnect once, e.g. after the server restarted.
+                await self._connect()
+                return await self._send(list(commands))
+
+    def _keys(self, session_id: str) -> tuple[str, str]:
+        return f"{self.prefix}:{session_id}:messages", f"{self.prefix}:{session_id}"
+
+    async def append(self, session_id: str, messages: list[Message], tokens: int) -> int:
+        messages_key, meta_key = self._keys(session_id)
+        replies = await self.execute(
+            ["MULTI"],
+            ["RPUSH", messages_key, *(json.dumps(message) for message in messages)],
+            ["HINCRBY", meta_key, "full_tokens", tokens],
+            ["EXEC"],
+        )
+        return replies[-1][0]
+
+    async def load(self, session_id: str) -> SessionSnapshot:
+        messages_key, meta_key = self._keys(session_id)
+        # The summary and the messages must come from the same moment, so both are
+        # read in one transaction. The range starts where the last load found the
+        # summary ending; if it has moved on since, the extra messages are dropped
+        # here, and if it moved back, the read is repeated from the new start.
+        start = self._covered.get(session_id, 0)
+        while True:
+            *_, (pairs, items) = await self.execute(
+                ["MULTI"], ["HGETALL", meta_key], ["LRANGE", messages_key, start, -1], ["EXEC"], retry=True
+            )
+            meta = {pairs[i].decode(): pairs[i + 1].decode() for i in range(0, len(pairs), 2)}
+            covered = int(meta.get("covered", 0))
+            if covered >= start:
+                break
+            start = covered
+        if len(self._covered) >= 10_000:
+            self._covered.clear()
+        self._covered[session_id] = covered
+        return SessionSnapshot(
+            summary=meta.get("summary", ""),
+            covered=covered,
+            messages=[json.loads(item) for item in items[covered - start :]],
+            full_tokens=int(meta.get("full_tokens", 0)),
+        )
+
+    async def length(self, session_id: str) -> int:
+        (length,) = await self.execute(["LLEN", self._keys(session_id)[0]], retry=True)
+        return length
+
+    async def set_summary(self, session_id: str, summary: str, covered: int) -> None:
+        await self.execute(["HSET", self._keys(session_id)[1], "summary", summary, "covered", covered])
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def get_session_backend(url: str) -> SessionBackend:
+    """Build a backend from ``sqlite:///path/to/file.db`` or ``redis://host:port/db``."""
+    parsed = urlparse(url)
+    if parsed.scheme == "sqlite":
+        return SQLiteSessionBackend(parsed.path.removeprefix("/") or "sessions.db")
+    if parsed.scheme == "redis":
+        return RedisSessionBackend(
+            host=parsed.hostname or "127.0.0.1",
+            port=parsed.port or 6379,
+            db=int(parsed.path.strip("/") or 0),
+        )
+    raise ValueError(f"Unsupported session backend URL: {url}")
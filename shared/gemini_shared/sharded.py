@@ -0,0 +1,156 @@
+"""Split a large batch across worker processes.
+
+One event loop spends most of its CPU on JSON, pydantic validation of
+``output_type`` results and SDK bookkeeping, so past a few hundred requests a
+second it, not the provider, is the bottleneck. ``run_sharded`` starts
+``processes`` workers; worker ``i`` reads every ``processes``-th prompt of the
+input file and runs them with ``run_batch`` on its own event loop and pooled
+client. Finished results come back to the parent already serialised, and the
+parent appends them to one output file as they arrive. All workers draw on the
+same ``SharedTokenBucket`` RPM/TPM budget.
+
+The agent is built in each worker by ``agent_factory``, a module-level
+function (agents with tools and hooks do not pickle), so scripts that use this
+need the usual ``if __name__ == "__main__":`` guard.
+"""
+
+import asyncio
+import multiprocessing
+import queue
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from agents import Agent
+
+from .batch import BatchSummary, batch_run_config, completed_ids, iter_prompts, run_batch
+from .client import DEFAULT_MODEL, aclose_client
+from .ratelimit import SharedTokenBucket
+
+# What workers send back: ("result", json_line, ok, input_tokens, output_tokens) or ("done", shard, error).
+_Message = tuple[Any, ...]
+
+
+def _worker(
+    shard: int,
+    shards: int,
+    agent_factory: Callable[[], Agent[Any]],
+    input_path: str,
+    output_path: str,
+    model_name: str,
+    concurrency: int,
+    ordered: bool,
+    resume: bool,
+    rpm: SharedTokenBucket | None,
+    tpm: SharedTokenBucket | None,
+    results: "multiprocessing.Queue[_Message]",
+) -> None:
+    async def run() -> None:
+        done = completed_ids(output_path) if resume else set()
+        items = (item for item in iter_prompts(input_path, shard, shards) if item.id not in done)
+        config = batch_run_config(model_name, rpm=rpm, tpm=tpm)
+        try:
+            async for result in run_batch(agent_factory(), items, config, concurrency, ordered):
+                results.put(("result", result.to_json(), result.error is None, result.input_tokens, result.output_tokens))
+        finally:
+            await aclose_client()
+
+    error = None
+    try:
+        asyncio.run(run())
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+    results.put(("done", shard, error))
+
+
+def run_sharded(
+    agent_factory: Callable[[], Agent[Any]],
+    input_path: str | Path,
+    output_path: str | Path,
+    processes: int | None = None,
+    concurrency: int = 8,
+    model_name: str = DEFAULT_MODEL,
+    rpm: float | None = None,
+    tpm: float | None = None,
+    ordered: bool = False,
+    resume: bool = True,
+) -> BatchSummary:
+    """Run a JSONL prompt file on ``processes`` worker processes and merge the results into ``output_path``.
+
+    ``concurrency`` is per worker. ``ordered`` keeps each shard in input
+    order; shards are interleaved as they finish.
+    """
+    processes = processes or multiprocessing.cpu_count()
+    context = multiprocessing.get_context("spawn")
+    rpm_bucket = SharedTokenBucket(rpm, context=context) if rpm else None
+    tpm_bucket = SharedTokenBucket(tpm, context=context) if tpm else None
+    results: multiprocessing.Queue[_Message] = context.Queue(maxsize=10_000)
+
+    skipped = len(completed_ids(output_path)) if resume else 0
+    summary = BatchSummary(total=0, skipped=skipped)
+    workers = [
+        context.Process(
+            target=_worker,
+            args=(
+                shard,
+                processes,
+                agent_factory,
+                str(input_path),
+                str(output_path),
+                model_name,
+                concurrency,
+                ordered,
+                resume,
+                rpm_bucket,
+                tpm_bucket,
+                results,
+            ),
+            daemon=True,
+        )
+        for shard in range(processes)
+    ]
+    started = time.perf_counter()
+    for process in workers:
+        process.start()
+
+    errors: list[str] = []
+    running = set(range(processes))
+    try:
+        with open(output_path, "a" if resume else "w", encoding="utf-8") as output:
+            while running:
+                try:
+                    message = results.get(timeout=1.0)
+                except queue.Empty:
+                    # A worker that died without saying so (e.g. killed) would otherwise hang the merge.
+                    for shard in list(running):
+                        if not workers[shard].is_alive() and results.empty():
+                            errors.append(f"worker {shard} exited with code {workers[shard].exitcode}")
+                            running.discard(shard)
+                    continue
+                if message[0] == "done":
+                    _, shard, error = message
+                    running.discard(shard)
+                    if error:
+                        errors.append(f"worker {shard}: {error}")
+                    continue
+                _, line, ok, input_tokens, output_tokens = message
+                output.write(line + "\n")
+                output.flush()
+                if ok:
+                    summary.succeeded += 1
+                else:
+                    summary.failed += 1
+                summary.input_tokens += input_tokens
+                summary.output_tokens += output_tokens
+    finally:
+        for process in workers:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+
+    summary.total = summary.skipped + summary.succeeded + summary.failed
+    summary.seconds = time.perf_counter() - started
+    if errors:
+        raise RuntimeError("Sharded batch incomplete; rerun to resume. " + "; ".join(errors))
+    return summary
@@ -0,0 +1,144 @@
+"""Share one execution between identical concurrent tool calls.
+
+When many runs ask about the same thing at once, each one calls the tool and
+the upstream API sees a burst of identical requests. ``single_flight`` wraps
+an async tool function so that a call whose arguments match a call that is
+still running waits for that call and gets its result (or its exception)
+instead of starting another one. It goes under ``@function_tool``:
+
+    @function_tool
+    @single_flight
+    async def get_weather(city: str) -> str: ...
+
+Arguments are compared after normalisation (strings are stripped,
+whitespace-collapsed and case-folded; a ``RunContextWrapper`` argument is
+ignored), or with a custom ``key`` function. With ``ttl`` a finished result is
+also reused for that many seconds. Counters per function are kept in
+``single_flight_stats``:
+
+* ``misses``: calls that ran the function;
+* ``coalesced``: calls that joined a call already in flight;
+* ``hits``: calls answered from a result finished less than ``ttl`` ago.
+
+The shared call runs in its own task, so cancelling one caller (a stopped
+run) does not cancel it for the others.
+"""
+
+import asyncio
+import functools
+import inspect
+import json
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, ParamSpec, TypeVar, overload
+
+from agents import RunContextWrapper
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+@dataclass
+class SingleFlightStats:
+    calls: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    hits: int = 0
+
+
+single_flight_stats: dict[str, SingleFlightStats] = {}
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.split()).casefold()
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    if hasattr(value, "model_dump"):
+        return _normalize(value.model_dump())
+    return value
+
+
+def call_key(signature: inspect.Signature, args: tuple[Any, ...], kwargs: dict[str, Any]) -> str:
+    """The normalised arguments of a call, as a string."""
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    arguments = {
+        name: _normalize(value)
+        for name, value in bound.arguments.items()
+        if not isinstance(value, RunContextWrapper)
+    }
+    return json.dumps(arguments, sort_keys=True, default=repr)
+
+
+@overload
+def single_flight(func: Callable[P, Awaitable[T]], /) -> Callable[P, Awaitable[T]]: ...
+
+
+@overload
+def single_flight(
+    *, ttl: float = 0.0, key: Callable[..., str] | None = None
+) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]: ...
+
+
+def single_flight(
+    func: Callable[P, Awaitable[T]] | None = None,
+    /,
+    *,
+    ttl: float = 0.0,
+    key: Callable[..., str] | None = None,
+) -> Any:
+    """De-duplicate concurrent identical calls of an async function.
+
+    ``key``, if given, is called with the function's arguments and returns
+    the string calls are compared by.
+    """
+
+    def decorate(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+        if not inspect.iscoroutinefunction(func):
+            raise TypeError(f"single_flight needs an async function; {func.__qualname__} is sync")
+        signature = inspect.signature(func)
+        stats = single_flight_stats.setdefault(func.__qualname__, SingleFlightStats())
+        in_flight: dict[str, asyncio.Task[T]] = {}
+        # key -> (finished at, result), only with ttl
+        finished: dict[str, tuple[float, T]] = {}
+
+        def remember(call: str, task: asyncio.Task[T]) -> None:
+            del in_flight[call]
+            # Reading the exception also keeps asyncio quiet when every caller has gone.
+            if task.cancelled() or task.exception() is not None or not ttl:
+                return
+            now = time.monotonic()
+            if len(finished) >= 1024:
+                for stale in [name for name, (finished_at, _) in finished.items() if now - finished_at >= ttl]:
+                    del finished[stale]
+            finished[call] = (now, task.result())
+
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            call = key(*args, **kwargs) if key is not None else call_key(signature, args, kwargs)
+            stats.calls += 1
+            if ttl and call in finished:
+                finished_at, result = finished[call]
+                if time.monotonic() - finished_at < ttl:
+                    stats.hits += 1
+                    return result
+                del finished[call]
+
+            task = in_flight.get(call)
+            if task is None:
+                stats.misses += 1
+                task = asyncio.ensure_future(func(*args, **kwargs))
+                in_flight[call] = task
+                task.add_done_callback(functools.partial(remember, call))
+            else:
+                stats.coalesced += 1
+            return await asyncio.shield(task)
+
+        wrapper.stats = stats  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorate(func) if func is not None else decorate
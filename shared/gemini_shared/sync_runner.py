@@ -0,0 +1,56 @@
+"""``Runner.run_sync`` for code that calls it over and over.
+
+Every sync entry point into the SDK needs an event loop. ``asyncio.run`` per
+call builds and closes a loop each time, and since the pooled client's
+connections belong to the loop they were opened on, it needs a new client
+(and new TCP/TLS handshakes) each time as well. ``Runner.run_sync`` reuses the
+main thread's loop, but fails in any other thread, and in the main thread too
+once something has called ``asyncio.run``.
+
+``run_sync`` sends every call to one ``BackgroundLoop`` that lives as long as
+the process, so the loop and the shared client's connections stay warm. It is
+safe to call from any number of threads; their runs share the loop and
+overlap on it. Async code must keep using ``await Runner.run`` (and the shared
+client must then not be used from another loop as well).
+
+    result = run_sync(agent, "Hello, how are you.", run_config=config)
+"""
+
+import threading
+from typing import Any
+
+from agents import Agent, Runner, RunResult, TResponseInputItem
+
+from .loop import BackgroundLoop
+
+_loop: BackgroundLoop | None = None
+_lock = threading.Lock()
+
+
+def get_background_loop() -> BackgroundLoop:
+    """Return the process-wide background loop, starting it on first use."""
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = BackgroundLoop(name="gemini-shared-sync")
+        return _loop
+
+
+def run_sync(
+    starting_agent: Agent[Any],
+    input: str | list[TResponseInputItem],
+    timeout: float | None = None,
+    **kwargs: Any,
+) -> RunResult:
+    """Drop-in for ``Runner.run_sync`` that runs on the shared background loop.
+
+    ``kwargs`` (``run_config``, ``context``, ``max_turns``, ...) are passed to
+    ``Runner.run``. ``timeout`` bounds the wait in seconds; the run is
+    cancelled when it expires.
+    """
+    future = get_background_loop().submit(Runner.run(starting_agent, input, **kwargs))
+    try:
+        return future.result(timeout)
+    except TimeoutError:
+        future.cancel()
+        raise
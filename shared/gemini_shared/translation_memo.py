@@ -0,0 +1,194 @@
+"""A persistent memo of finished translations.
+
+UI strings and canned replies get translated over and over, and each repeat
+costs a translator agent's model call. ``TranslationMemo`` remembers every
+translation in one SQLite file, keyed by a hash of:
+
+* the source text, NFC-normalised with whitespace collapsed (case is kept,
+  since it can change a translation);
+* the target language;
+* the translator's model name;
+* a hash of the translator's instructions, so editing a prompt or switching
+  models never serves the old wording.
+
+A bounded in-memory LRU sits in front of the file. A hit there is a dict
+lookup, and a hit in the file is one indexed query on a worker thread. When
+the file holds more than ``max_entries`` rows, the least recently used tenth
+is deleted. ``used_at`` is refreshed when an entry is read from the file,
+not on every memory hit.
+
+    memo = TranslationMemo("translations.db")
+    text = await memo.translate(spanish_agent, "spanish", "Good morning")
+
+Behind an orchestrator, pass ``memo.translate`` as the ``run`` hook of
+``multiplex_tool``, so the sub-agent only runs on a miss:
+
+    multiplex_tool(
+        translators, "translate", "Translate the user's message",
+        run=lambda language, text: memo.translate(translators[language], language, text),
+    )
+
+``load_csv`` warms the memo up from a file with ``text,language,translation``
+columns.
+"""
+
+import asyncio
+import csv
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from agents import Agent, Runner
+
+
+@dataclass
+class MemoStats:
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    stored: int = 0
+    evicted: int = 0
+    loaded: int = 0
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def model_name(agent: Agent[Any]) -> str:
+    """The model name behind ``agent``, looking through wrappers such as ``AdaptiveModel``."""
+    model: Any = agent.model
+    while model is not None and not isinstance(model, str):
+        model = getattr(model, "model", None)
+    return model or "default"
+
+
+def memo_key(text: str, language: str, model: str, instructions: str) -> str:
+    instructions_hash = hashlib.sha256(instructions.encode()).hexdigest()
+    parts = [normalize_text(text), language.casefold(), model, instructions_hash]
+    return hashlib.sha256(json.dumps(parts, ensure_ascii=False).encode()).hexdigest()
+
+
+def agent_key(agent: Agent[Any], language: str, text: str) -> str:
+    if not isinstance(agent.instructions, str):
+        raise TypeError(f"{agent.name} has dynamic instructions, so its translations cannot be memoised")
+    return memo_key(text, language, model_name(agent), agent.instructions)
+
+
+class TranslationMemo:
+    def __init__(self, path: str = "translations.db", max_entries: int = 100_000, memory_entries: int = 4096):
+        self.max_entries = max_entries
+        self.memory_entries = memory_entries
+        self.stats = MemoStats()
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS translations (key TEXT PRIMARY KEY, language TEXT NOT NULL, "
+            "model TEXT NOT NULL, source TEXT NOT NULL, translation TEXT NOT NULL, used_at REAL NOT NULL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS translations_used_at ON translations (used_at)")
+        (self._rows,) = self.db.execute("SELECT COUNT(*) FROM translations").fetchone()
+        self._lock = threading.Lock()
+
+    def _remember(self, key: str, translation: str) -> None:
+        self._memory[key] = translation
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _read(self, key: str) -> str | None:
+        with self._lock:
+            row = self.db.execute("SELECT translation FROM translations WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self.db.execute("UPDATE translations SET used_at = ? WHERE key = ?", (time.time(), key))
+        return row[0] if row else None
+
+    def _write(self, rows: list[tuple[str, str, str, str, str]]) -> None:
+        now = time.time()
+        with self._lock:
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                before = self.db.total_changes
+                self.db.executemany(
+                    "INSERT OR REPLACE INTO translations (key, language, model, source, translation, used_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(*row, now) for row in rows],
+                )
+                self.db.execute("COMMIT")
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+            # Replaced rows count too, so this can run high; eviction recounts.
+            self._rows += self.db.total_changes - before
+            if self._rows > self.max_entries:
+                (self._rows,) = self.db.execute("SELECT COUNT(*) FROM translations").fetchone()
+            if self._rows > self.max_entries:
+                # Evict a tenth at a time so a full memo is not trimmed on every write.
+                excess = self._rows - self.max_entries + max(self.max_entries // 10, 1)
+                deleted = self.db.execute(
+                    "DELETE FROM translations WHERE key IN "
+                    "(SELECT key FROM translations ORDER BY used_at LIMIT ?)",
+                    (excess,),
+                ).rowcount
+                self._rows -= deleted
+                self.stats.evicted += deleted
+
+    async def get(self, agent: Agent[Any], language: str, text: str) -> str | None:
+        """The memoised translation of ``text`` by ``agent``, or ``None``."""
+        key = agent_key(agent, language, text)
+        translation = self._memory.get(key)
+        if translation is not None:
+            self._memory.move_to_end(key)
+            self.stats.hits += 1
+            return translation
+        translation = await asyncio.to_thread(self._read, key)
+        if translation is None:
+            self.stats.misses += 1
+            return None
+        self.stats.disk_hits += 1
+        self._remember(key, translation)
+        return translation
+
+    async def put(self, agent: Agent[Any], language: str, text: str, translation: str) -> None:
+        key = agent_key(agent, language, text)
+        self._remember(key, translation)
+        row = (key, language.casefold(), model_name(agent), normalize_text(text), translation)
+        await asyncio.to_thread(self._write, [row])
+        self.stats.stored += 1
+
+    async def translate(self, agent: Agent[Any], language: str, text: str, **kwargs: Any) -> str:
+        """``text`` translated by ``agent``, from the memo when it has been translated before."""
+        translation = await self.get(agent, language, text)
+        if translation is None:
+            result = await Runner.run(agent, text, **kwargs)
+            translation = str(result.final_output)
+            await self.put(agent, language, text, translation)
+        return translation
+
+    def load_csv(self, path: str, translators: Mapping[str, Agent[Any]]) -> int:
+        """Store every ``text,language,translation`` row whose language is in ``translators``."""
+        rows = []
+        with open(path, newline="", encoding="utf-8") as f:
+            for record in csv.DictReader(f):
+                agent = translators.get(record["language"].strip().casefold())
+                if agent is None:
+                    continue
+                language, text = record["language"].strip().casefold(), record["text"]
+                key = agent_key(agent, language, text)
+                rows.append((key, language, model_name(agent), normalize_text(text), record["translation"]))
+        for start in range(0, len(rows), 1000):
+            self._write(rows[start : start + 1000])
+        self.stats.loaded += len(rows)
+        return len(rows)
+
+    def close(self) -> None:
+        self.db.close()
@@ -0,0 +1,156 @@
+"""Async, pooled and cached access to the weatherapi.com current-weather API.
+
+The lessons' ``get_weather`` tool used to call ``requests.get`` on the event
+loop, so one slow weather call stalled every other run in the process, and
+each call opened a new connection. ``WeatherClient`` uses one pooled
+``httpx.AsyncClient`` with strict timeouts and caches answers per city:
+
+* a city is normalised ("  Lahore " and "lahore" are the same entry);
+* an entry younger than ``ttl`` is returned as is;
+* an entry older than ``ttl`` but younger than ``ttl + stale_ttl`` is returned
+  at once while one background request refreshes it (stale-while-revalidate);
+* if fetching fails and any cached entry exists, the cached entry is returned.
+
+    weather = get_weather_client()
+    current = await weather.current("lahore")   # the API's "current" object
+
+``WEATHER_API_KEY`` must hold a weatherapi.com key, unless
+``WEATHER_BASE_URL`` points elsewhere, for example at ``FakeWeatherServer``.
+"""
+
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+WEATHER_BASE_URL = "http://api.weatherapi.com/v1/"
+
+WEATHER_CONNECT_TIMEOUT = float(os.getenv("WEATHER_CONNECT_TIMEOUT", "2"))
+WEATHER_READ_TIMEOUT = float(os.getenv("WEATHER_READ_TIMEOUT", "5"))
+
+
+class WeatherError(Exception):
+    """The weather API answered with an error (for example an unknown city)."""
+
+
+def normalize_city(city: str) -> str:
+    return " ".join(city.split()).casefold()
+
+
+@dataclass
+class WeatherStats:
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+    errors: int = 0
+    served_after_error: int = 0
+
+
+class WeatherClient:
+    def __init__(
+        self,
+        base_url: str | None = None,
+        api_key: str | None = None,
+        ttl: float = 600.0,
+        stale_ttl: float = 3600.0,
+        max_entries: int = 10_000,
+    ):
+        self.base_url = base_url or os.getenv("WEATHER_BASE_URL", WEATHER_BASE_URL)
+        self.api_key = api_key or os.getenv("WEATHER_API_KEY", "")
+        if not self.api_key and self.base_url == WEATHER_BASE_URL:
+            # The fake weather server ignores the key, so only the real API needs one.
+            raise ValueError(
+                "WEATHER_API_KEY is not set. Get a key from weatherapi.com and define it in your .env file, "
+                "or point WEATHER_BASE_URL at gemini_shared.fake_weather."
+            )
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.stats = WeatherStats()
+        self._http: httpx.AsyncClient | None = None
+        # normalised city -> (fetched at, "current" object)
+        self._cache: dict[str, tuple[float, dict[str, Any]]] = {}
+        self._refreshing: dict[str, asyncio.Task[None]] = {}
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=10),
+                timeout=httpx.Timeout(WEATHER_READ_TIMEOUT, connect=WEATHER_CONNECT_TIMEOUT),
+            )
+        return self._http
+
+    async def _fetch(self, key: str) -> dict[str, Any]:
+        response = await self._client().get("current.json", params={"key": self.api_key, "q": key})
+        if response.status_code != 200:
+            try:
+                message = response.json()["error"]["message"]
+            except (ValueError, KeyError, TypeError):
+                message = f"HTTP {response.status_code}"
+            raise WeatherError(f"Weather lookup for {key!r} failed: {message}")
+        current = response.json()["current"]
+        if len(self._cache) >= self.max_entries and key not in self._cache:
+            # Drop the oldest entry; dicts keep insertion order.
+            del self._cache[next(iter(self._cache))]
+        self._cache.pop(key, None)
+        self._cache[key] = (time.monotonic(), current)
+        return current
+
+    async def _refresh(self, key: str) -> None:
+        try:
+            await self._fetch(key)
+            self.stats.refreshes += 1
+        except Exception:
+            # The stale entry stays; the next caller after it expires tries again.
+            self.stats.errors += 1
+        finally:
+            del self._refreshing[key]
+
+    async def current(self, city: str) -> dict[str, Any]:
+        """The API's ``current`` object for ``city``, from the cache when possible."""
+        key = normalize_city(city)
+        cached = self._cache.get(key)
+        if cached is not None:
+            fetched_at, current = cached
+            age = time.monotonic() - fetched_at
+            if age < self.ttl:
+                self.stats.hits += 1
+                return current
+            if age < self.ttl + self.stale_ttl:
+                self.stats.stale_hits += 1
+                if key not in self._refreshing:
+                    self._refreshing[key] = asyncio.create_task(self._refresh(key))
+                return current
+
+        self.stats.misses += 1
+        try:
+            return await self._fetch(key)
+        except (httpx.HTTPError, WeatherError, KeyError, ValueError):
+            self.stats.errors += 1
+            if cached is not None:
+                self.stats.served_after_error += 1
+                return cached[1]
+            raise
+
+    async def aclose(self) -> None:
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+
+_weather_client: WeatherClient | None = None
+
+
+def get_weather_client() -> WeatherClient:
+    """Return the process-wide ``WeatherClient``."""
+    global _weather_client
+    if _weather_client is None:
+        _weather_client = WeatherClient()
+    return _weather_client